@@ -2,93 +2,68 @@ from langchain_neo4j import Neo4jGraph, GraphCypherQAChain
 from langchain_openai import ChatOpenAI
 from langchain_core.prompts import PromptTemplate
 from dotenv import load_dotenv
+from functools import lru_cache
 import os
 
+from prompts import CYPHER_TEMPLATE, QA_TEMPLATE
+
 load_dotenv()
 
-# Connect to Neo4j
-graph = Neo4jGraph(
-    url=os.getenv("NEO4J_URI"),
-    username=os.getenv("NEO4J_USER"),
-    password=os.getenv("NEO4J_PASSWORD")
-)
 
-# Initialize Claude via OpenRouter
-llm = ChatOpenAI(
-    model="anthropic/claude-sonnet-4",
-    api_key=os.getenv("OPENROUTER_API_KEY"),
-    base_url="https://openrouter.ai/api/v1",
-    temperature=0,
-    max_tokens=1024
-)
+@lru_cache(maxsize=None)
+def get_graph() -> Neo4jGraph:
+    """Connect to Neo4j (one shared instance per process)."""
+    return Neo4jGraph(
+        url=os.getenv("NEO4J_URI"),
+        username=os.getenv("NEO4J_USER"),
+        password=os.getenv("NEO4J_PASSWORD")
+    )
+
+
+@lru_cache(maxsize=None)
+def get_llm() -> ChatOpenAI:
+    """Initialize Claude via OpenRouter (one shared instance per process)."""
+    return ChatOpenAI(
+        model="anthropic/claude-sonnet-4",
+        api_key=os.getenv("OPENROUTER_API_KEY"),
+        base_url="https://openrouter.ai/api/v1",
+        temperature=0,
+        max_tokens=1024
+    )
 
 # Custom prompt for transfer analysis
 CYPHER_PROMPT = PromptTemplate(
     input_variables=["schema", "question"],
-    template="""You are a football transfer analyst expert. Generate a Cypher query to answer the question.
-
-Schema:
-{schema}
-
-Key relationships:
-- (Player)-[:PLAYS_FOR]->(Team)
-- (Player)-[:HAS_STATS]->(Stats)
-- (Player)-[:HAS_CONTRACT]->(Contract)
-- (Team)-[:PARTICIPATES_IN]->(League)
-
-Player properties: name, age, nationality, height, preferred_foot, preferred_positions, market_value
-Stats properties: total_matches, total_goals, total_assists, total_yellow, goals_conceded, clean_sheets
-
-For position searches, use CONTAINS on preferred_positions (e.g., "Centre-Forward", "Central Midfield", "Goalkeeper", "Defensive Midfield", "Left Winger", "Right-Back")
-
-Market values are stored as strings like "€1.20m" or "€500k".
-
-Question: {question}
-
-Return relevant player data including stats for comparison. Always include name, age, market_value, and stats when comparing players.
-
-Cypher Query:"""
+    template=CYPHER_TEMPLATE
 )
 
 QA_PROMPT = PromptTemplate(
     input_variables=["context", "question"],
-    template="""You are a football transfer analyst. Based on the data, provide transfer recommendations and player analysis.
-
-Data from database:
-{context}
-
-Question: {question}
-
-Provide a clear analysis with:
-1. Player recommendations ranked by fit
-2. Key stats comparison (goals, assists, matches)
-3. Value for money assessment (age vs market value)
-4. Transfer recommendation with reasoning
-
-Be specific and use the actual data provided. Format the response clearly.
-
-Answer:"""
+    template=QA_TEMPLATE
 )
 
-# Create GraphRAG chain with custom prompts
-chain = GraphCypherQAChain.from_llm(
-    llm=llm,
-    graph=graph,
-    cypher_prompt=CYPHER_PROMPT,
-    qa_prompt=QA_PROMPT,
-    verbose=False,  # Set to True for debugging
-    allow_dangerous_requests=True,
-    return_intermediate_steps=False
-)
+# Create GraphRAG chain with custom prompts, built lazily on first use
+@lru_cache(maxsize=None)
+def get_chain() -> GraphCypherQAChain:
+    return GraphCypherQAChain.from_llm(
+        llm=get_llm(),
+        graph=get_graph(),
+        cypher_prompt=CYPHER_PROMPT,
+        qa_prompt=QA_PROMPT,
+        verbose=False,  # Set to True for debugging
+        allow_dangerous_requests=True,
+        return_intermediate_steps=False
+    )
+
 
 # Export for use by other modules
-__all__ = ['chain', 'graph', 'llm', 'analyze_transfer', 'compare_players', 'find_players_for_position']
+__all__ = ['get_chain', 'get_graph', 'get_llm', 'analyze_transfer', 'compare_players', 'find_players_for_position']
 
 
 def analyze_transfer(question: str) -> str:
     """Run transfer analysis query"""
     try:
-        response = chain.invoke({"query": question})
+        response = get_chain().invoke({"query": question})
         return response["result"]
     except Exception as e:
         return f"Error: {e}"
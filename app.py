@@ -4,85 +4,152 @@ GraphRAG-powered football analytics platform
 """
 
 import os
+import re
+import json
+import time
+import asyncio
+import hashlib
 import pandas as pd
 from dotenv import load_dotenv
-from fastapi import FastAPI, HTTPException
+from fastapi import FastAPI, HTTPException, Depends
+from fastapi.middleware.gzip import GZipMiddleware
 from fastapi.staticfiles import StaticFiles
-from fastapi.responses import FileResponse
-from pydantic import BaseModel
-from typing import Optional, List
-from neo4j import GraphDatabase
-from openai import OpenAI
+from fastapi.responses import FileResponse, StreamingResponse, ORJSONResponse
+from pydantic import BaseModel, Field
+from typing import Optional, List, Final
+from neo4j import AsyncGraphDatabase
+from openai import AsyncOpenAI
+
+# Optional: C-backed multi-pattern matcher for team mention detection
+try:
+    import ahocorasick
+except ImportError:
+    ahocorasick = None
 
 # Load environment variables
 load_dotenv()
 
 # Import GraphRAG from Agent.py
-from Agent import chain as graph_chain, analyze_transfer
+from Agent import get_chain, analyze_transfer
+
+# Prompt templates, compiled once at import and shared with Agent.py
+import prompts
 
 # Initialize FastAPI
-app = FastAPI(title="Football Scout AI")
+app = FastAPI(title="Football Scout AI", default_response_class=ORJSONResponse)
 
-# Neo4j connection
-neo4j_driver = GraphDatabase.driver(
+# Compress large JSON responses (search results, squad payloads, AI analyses)
+app.add_middleware(GZipMiddleware, minimum_size=1024, compresslevel=5)
+
+# Neo4j connection (async driver so Cypher round-trips don't block the event loop)
+neo4j_driver = AsyncGraphDatabase.driver(
     os.getenv("NEO4J_URI"),
-    auth=(os.getenv("NEO4J_USER"), os.getenv("NEO4J_PASSWORD"))
+    auth=(os.getenv("NEO4J_USER"), os.getenv("NEO4J_PASSWORD")),
+    max_connection_pool_size=int(os.getenv("NEO4J_POOL", "64")),
+    connection_acquisition_timeout=15,
+    max_transaction_retry_time=15
 )
 
-# OpenRouter LLM client
-llm_client = OpenAI(
+
+@app.on_event("shutdown")
+async def close_neo4j():
+    """Close the Neo4j driver on shutdown."""
+    await neo4j_driver.close()
+
+# OpenRouter LLM client (async so the event loop is free during LLM calls)
+llm_client = AsyncOpenAI(
     base_url="https://openrouter.ai/api/v1",
     api_key=os.getenv("OPENROUTER_API_KEY")
 )
 
 LLM_MODEL = "anthropic/claude-sonnet-4"
 
+# Naming the database explicitly avoids the driver's per-query lookup of the
+# server-side default
+NEO4J_DATABASE = os.getenv("NEO4J_DATABASE", "neo4j")
+
+# Single-pass chat intent detection (one regex scan instead of N substring checks)
+INTENT_RE = re.compile(
+    r"(?P<scorer>top scorer|most goals|best striker)"
+    r"|(?P<young>young|talent|prospect|under 2[13])"
+)
+
+# Market values are stored as strings like "€1.20m" or "€500k"
+_VALUE_RE = re.compile(r"([\d.,]+)\s*([mMkK]?)")
+_VALUE_MULT = {"m": 1e6, "M": 1e6, "k": 1e3, "K": 1e3, "": 1.0}
+
+
+def parse_value(value) -> float:
+    """Parse a market value string like '€1.20m' into euros."""
+    if not value:
+        return 0.0
+    match = _VALUE_RE.search(str(value))
+    return float(match.group(1).replace(",", "")) * _VALUE_MULT[match.group(2)] if match else 0.0
+
 
 # ============== SofaScore Mappings ==============
 
-def load_mappings():
-    """Load SofaScore ID mappings from CSV files."""
-    player_mapping = {}
-    team_mapping = {}
+def _load_mapping_csv(path: str, label: str) -> dict:
+    """Load one tm_id -> sofascore_id mapping as a dict.
 
-    # Load player mapping
+    Prefers the Feather twin of the CSV (written by build_sofascore_mapping):
+    memory-mapped, so multiple uvicorn workers share the OS page cache and
+    skip CSV parsing entirely.
+    """
     try:
-        df = pd.read_csv("tm_sofascore_mapping.csv")
-        for _, row in df.iterrows():
-            if pd.notna(row.get("sofascore_id")):
-                player_mapping[int(row["tm_id"])] = int(float(row["sofascore_id"]))
-        print(f"Loaded {len(player_mapping)} player mappings")
-    except FileNotFoundError:
-        print("Warning: tm_sofascore_mapping.csv not found")
+        import pyarrow.feather as feather
+        table = feather.read_table(path.replace(".csv", ".feather"), memory_map=True)
+        mapping = dict(zip(table["tm_id"].to_pylist(), table["sofascore_id"].to_pylist()))
+        print(f"Loaded {len(mapping)} {label} mappings (feather)")
+        return mapping
+    except Exception:
+        pass  # no feather file (or no pyarrow): fall back to the CSV
 
-    # Load team mapping
     try:
-        df = pd.read_csv("tm_sofascore_team_mapping.csv")
-        for _, row in df.iterrows():
-            if pd.notna(row.get("sofascore_id")):
-                team_mapping[int(row["tm_id"])] = int(float(row["sofascore_id"]))
-        print(f"Loaded {len(team_mapping)} team mappings")
+        # Explicit dtypes skip type inference; columnar ops replace iterrows
+        df = pd.read_csv(
+            path, usecols=["tm_id", "sofascore_id"],
+            dtype={"tm_id": "Int64", "sofascore_id": "Int64"},
+            engine="pyarrow"
+        ).dropna(subset=["sofascore_id"])
+        mapping = dict(zip(df["tm_id"].to_numpy(), df["sofascore_id"].to_numpy()))
+        print(f"Loaded {len(mapping)} {label} mappings")
+        return mapping
     except FileNotFoundError:
-        print("Warning: tm_sofascore_team_mapping.csv not found")
+        print(f"Warning: {path} not found")
+        return {}
+
 
+def load_mappings():
+    """Load SofaScore ID mappings from CSV files."""
+    player_mapping = _load_mapping_csv("tm_sofascore_mapping.csv", "player")
+    team_mapping = _load_mapping_csv("tm_sofascore_team_mapping.csv", "team")
     return player_mapping, team_mapping
 
 
 PLAYER_SOFASCORE_MAP, TEAM_SOFASCORE_MAP = load_mappings()
 
 
-def add_sofascore_id(player: dict) -> dict:
-    """Add sofascore_id to a player dict if mapping exists."""
-    if player.get("id"):
-        player["sofascore_id"] = PLAYER_SOFASCORE_MAP.get(int(player["id"]))
-    return player
+def add_sofascore_ids(players: list) -> list:
+    """Fill in sofascore_id where the graph doesn't carry it yet.
 
+    Queries return p.sofascore_id directly; this only backfills from the CSV
+    mapping for graphs loaded before load_to_neo4j set the property.
+    """
+    get = PLAYER_SOFASCORE_MAP.get  # one bound-method lookup for the whole list
+    for player in players:
+        if player.get("sofascore_id") is None and player.get("id"):
+            player["sofascore_id"] = get(player["id"])
+    return players
 
-def add_team_sofascore_id(team: dict) -> dict:
-    """Add sofascore_id to a team dict if mapping exists."""
-    if team.get("id"):
-        team["sofascore_id"] = TEAM_SOFASCORE_MAP.get(int(team["id"]))
-    return team
+
+def add_team_sofascore_ids(teams: list) -> list:
+    """Fill in sofascore_id for team dicts, like add_sofascore_ids."""
+    get = TEAM_SOFASCORE_MAP.get
+    for team in teams:
+        if team.get("sofascore_id") is None and team.get("id"):
+            team["sofascore_id"] = get(team["id"])
+    return teams
 
 
 # ============== Pydantic Models ==============
@@ -95,10 +162,13 @@ class SearchFilters(BaseModel):
     max_value: Optional[int] = None
     team: Optional[str] = None
     exclude_team: Optional[str] = None  # Exclude players from this team
+    offset: int = Field(0, ge=0)
+    limit: int = Field(50, ge=1, le=100)
 
 
 class CompareRequest(BaseModel):
     players: List[dict]
+    stream: bool = False  # Stream the analysis as server-sent events
 
 
 class ScoutRequest(BaseModel):
@@ -106,34 +176,374 @@ class ScoutRequest(BaseModel):
     position: Optional[str] = None
     budget: Optional[int] = None
     priority: Optional[str] = None
+    stream: bool = False  # Stream the recommendation as server-sent events
 
 
 class ChatRequest(BaseModel):
     message: str
     team_id: Optional[int] = None
+    stream: bool = False  # Stream the answer as server-sent events
+
+
+# ============== Cypher Queries ==============
+# Module-level constants: the same query text is sent on every call, so the
+# server-side query plan cache always hits.
+
+_Q_TEAMS_LIST: Final[str] = "MATCH (t:Team) RETURN t.id AS id, t.name AS name"
+
+_Q_TEAM_NAME: Final[str] = "MATCH (t:Team {id: $team_id}) RETURN t.name AS name"
+
+_Q_FILTERS: Final[str] = """
+    CALL {
+        MATCH (p:Player)
+        WHERE p.nationality IS NOT NULL AND p.nationality <> ''
+        RETURN collect(DISTINCT p.nationality) AS nats
+    }
+    CALL {
+        MATCH (t:Team)
+        WHERE t.name IS NOT NULL
+        RETURN collect({id: t.id, name: t.name, sofascore_id: t.sofascore_id}) AS teams
+    }
+    RETURN nats, teams
+"""
+
+_Q_TEAM_SQUAD: Final[str] = """
+    MATCH (t:Team {id: $team_id})<-[:PLAYS_FOR]-(p:Player)
+    OPTIONAL MATCH (p)-[:HAS_STATS]->(s:Stats)
+    RETURN p.id AS id, p.name AS name, p.age AS age,
+           p.nationality AS nationality, p.market_value AS market_value,
+           p.preferred_positions AS position, p.sofascore_id AS sofascore_id,
+           s.total_goals AS goals, s.total_assists AS assists,
+           s.total_matches AS matches
+    ORDER BY p.name
+"""
+
+_Q_SCOUT_TEAM_CONTEXT: Final[str] = """
+    MATCH (t:Team {id: $team_id})<-[:PLAYS_FOR]-(p:Player)
+    OPTIONAL MATCH (p)-[:HAS_STATS]->(s:Stats)
+    RETURN t.name AS team_name, collect({
+        name: p.name,
+        position: p.preferred_positions,
+        age: p.age,
+        goals: s.total_goals
+    }) AS players
+"""
+
+_Q_SCOUT_CANDIDATES: Final[str] = """
+    MATCH (p:Player)-[:HAS_STATS]->(s:Stats)
+    OPTIONAL MATCH (p)-[:PLAYS_FOR]->(t:Team)
+    WITH p, s, t
+    WHERE p.market_value IS NOT NULL
+      AND ($position IS NULL OR p.preferred_positions CONTAINS $position)
+      AND ($team_id IS NULL OR t IS NULL OR t.id <> $team_id)
+    RETURN p.name AS name, p.age AS age, p.nationality AS nationality,
+           p.preferred_positions AS position, p.market_value AS market_value,
+           s.total_goals AS goals, s.total_assists AS assists, t.name AS team
+    ORDER BY s.total_goals DESC
+    LIMIT 15
+"""
+
+_Q_TEAM_META: Final[str] = """
+    MATCH (t:Team {id: $team_id})<-[:PLAYS_FOR]-(p:Player)
+    OPTIONAL MATCH (p)-[:HAS_STATS]->(s:Stats)
+    RETURN t.name AS team_name, t.id AS team_id,
+           count(p) AS player_count,
+           avg(p.age) AS avg_age,
+           sum(s.total_goals) AS total_goals,
+           sum(p.market_value_eur) AS total_value_eur
+"""
+
+_Q_TEAM_PLAYERS: Final[str] = """
+    MATCH (t:Team {id: $team_id})<-[:PLAYS_FOR]-(p:Player)
+    OPTIONAL MATCH (p)-[:HAS_STATS]->(s:Stats)
+    RETURN p.id AS id, p.name AS name, p.preferred_positions AS position,
+           p.age AS age, p.nationality AS nationality,
+           p.market_value AS market_value, p.sofascore_id AS sofascore_id,
+           COALESCE(s.total_goals, 0) AS goals,
+           COALESCE(s.total_assists, 0) AS assists,
+           COALESCE(s.total_matches, 0) AS matches
+    ORDER BY goals DESC
+    SKIP $offset LIMIT $player_limit
+"""
+
+_Q_TOP_SCORERS: Final[str] = """
+    MATCH (p:Player)-[:HAS_STATS]->(s:Stats)
+    RETURN p.name AS name, s.total_goals AS goals
+    ORDER BY s.total_goals DESC LIMIT 5
+"""
+
+_Q_YOUNG_TALENTS: Final[str] = """
+    MATCH (p:Player)
+    WHERE p.age IS NOT NULL AND p.age <= 21
+    OPTIONAL MATCH (p)-[:HAS_STATS]->(s:Stats)
+    RETURN p.name AS name, p.age AS age, p.market_value AS market_value,
+           COALESCE(s.total_goals, 0) AS goals
+    ORDER BY goals DESC LIMIT 5
+"""
+
+_Q_GENERAL_STATS: Final[str] = """
+    MATCH (p:Player)
+    OPTIONAL MATCH (p)-[:HAS_STATS]->(s:Stats)
+    RETURN count(DISTINCT p) AS total_players,
+           avg(p.age) AS avg_age,
+           sum(s.total_goals) AS total_goals
+"""
+
+
+# One static search query: null parameters disable their predicate, so every
+# filter combination shares a single cached plan server-side
+_Q_SEARCH: Final[str] = """
+    MATCH (p:Player)
+    WHERE ($position IS NULL OR p.preferred_positions CONTAINS $position)
+      AND ($nationality IS NULL OR p.nationality = $nationality)
+      AND ($min_age IS NULL OR p.age >= $min_age)
+      AND ($max_age IS NULL OR p.age <= $max_age)
+      AND ($max_value IS NULL OR p.market_value_eur IS NULL
+           OR p.market_value_eur <= $max_value)
+    WITH p LIMIT 500
+    OPTIONAL MATCH (p)-[:PLAYS_FOR]->(t:Team)
+    WITH p, t
+    WHERE ($team_id IS NULL OR (t IS NOT NULL AND t.id = $team_id))
+      AND ($exclude_team_id IS NULL OR t IS NULL OR t.id <> $exclude_team_id)
+    OPTIONAL MATCH (p)-[:HAS_STATS]->(s:Stats)
+    RETURN p.id AS id, p.name AS name, p.age AS age,
+           p.nationality AS nationality, p.market_value AS market_value,
+           p.preferred_positions AS position, p.sofascore_id AS sofascore_id,
+           t.name AS team, t.id AS team_id,
+           COALESCE(s.total_goals, 0) AS goals,
+           COALESCE(s.total_assists, 0) AS assists,
+           COALESCE(s.total_matches, 0) AS matches
+    ORDER BY goals DESC
+    SKIP $offset LIMIT $limit
+"""
 
 
 # ============== Neo4j Helpers ==============
 
-def run_query(query: str, params: dict = None):
-    """Execute a Neo4j query and return results."""
-    with neo4j_driver.session() as session:
-        result = session.run(query, params or {})
-        return [record.data() for record in result]
+async def get_session():
+    """FastAPI dependency yielding a request-scoped Neo4j session."""
+    async with neo4j_driver.session(database=NEO4J_DATABASE) as session:
+        yield session
+
+
+async def run_query(query: str, params: dict = None, session=None):
+    """Execute a read query and return results.
+
+    When a session is passed (request-scoped via Depends(get_session)), it is
+    reused instead of acquiring a fresh one from the pool.
+    """
+    if session is not None:
+        result = await session.run(query, params or {})
+        return [record.data() async for record in result]
+
+    async def work(tx):
+        result = await tx.run(query, params or {})
+        return [record.data() async for record in result]
+
+    async with neo4j_driver.session(database=NEO4J_DATABASE) as session:
+        return await session.execute_read(work)
+
+
+async def _noop_query():
+    """Placeholder awaitable for optional queries in asyncio.gather calls."""
+    return []
+
+
+# ============== Teams Cache ==============
+
+_TEAMS_TTL = 300  # seconds
+_TEAMS: list = []
+_TEAMS_BY_LOWER: dict = {}
+_TEAMS_AUTOMATON = None
+_TEAMS_LOADED_AT: float = 0.0
+
+
+async def get_teams_cached():
+    """Return the teams list, refreshed from Neo4j at most every _TEAMS_TTL seconds."""
+    global _TEAMS, _TEAMS_BY_LOWER, _TEAMS_AUTOMATON, _TEAMS_LOADED_AT
+    if not _TEAMS or time.time() - _TEAMS_LOADED_AT > _TEAMS_TTL:
+        _TEAMS = await run_query(_Q_TEAMS_LIST)
+        _TEAMS_BY_LOWER = {t["name"].lower(): t for t in _TEAMS if t["name"]}
+        if ahocorasick:
+            automaton = ahocorasick.Automaton()
+            for name, team in _TEAMS_BY_LOWER.items():
+                automaton.add_word(name, (team["id"], team["name"]))
+            automaton.make_automaton()
+            _TEAMS_AUTOMATON = automaton
+        _TEAMS_LOADED_AT = time.time()
+    return _TEAMS
+
+
+def find_mentioned_team(message: str):
+    """Find a team mentioned by name in a lowercased message."""
+    if _TEAMS_AUTOMATON is not None:
+        # One linear scan over the message regardless of how many teams exist
+        for _, (team_id, team_name) in _TEAMS_AUTOMATON.iter(message):
+            return {"id": team_id, "name": team_name}
+        return None
+    for name, team in _TEAMS_BY_LOWER.items():
+        if name in message:
+            return team
+    return None
+
+
+@app.on_event("startup")
+async def preload_teams():
+    """Warm the teams cache so the first chat request doesn't pay for it."""
+    try:
+        await get_teams_cached()
+    except Exception as e:
+        print(f"Warning: could not preload teams cache: {e}")
+
 
+# ============== LLM Response Cache ==============
 
-def get_llm_response(prompt: str, max_tokens: int = 1000) -> str:
-    """Get response from LLM via OpenRouter."""
+# Exact-match response cache: Redis when REDIS_URL is set, in-process otherwise
+try:
+    import redis.asyncio as aioredis
+except ImportError:
+    aioredis = None
+
+_LLM_CACHE_TTL = 3600  # seconds
+_LLM_CACHE_MAX = 256   # entries the in-process fallback cache may hold
+_llm_cache = {}  # key -> (expires_at, response)
+_redis = aioredis.from_url(os.getenv("REDIS_URL")) if (aioredis and os.getenv("REDIS_URL")) else None
+
+
+def _llm_cache_key(prompt: str) -> str:
+    return "llm:" + hashlib.sha256((LLM_MODEL + prompt).encode()).hexdigest()
+
+
+async def _llm_cache_get(key: str):
+    if _redis is not None:
+        cached = await _redis.get(key)
+        return cached.decode() if cached else None
+    entry = _llm_cache.get(key)
+    if entry is None:
+        return None
+    if entry[0] <= time.time():
+        del _llm_cache[key]  # drop expired entries instead of stranding them
+        return None
+    return entry[1]
+
+
+async def _llm_cache_set(key: str, response: str):
+    if _redis is not None:
+        await _redis.setex(key, _LLM_CACHE_TTL, response)
+    else:
+        now = time.time()
+        if len(_llm_cache) >= _LLM_CACHE_MAX:
+            # Shed expired entries first, then oldest-inserted, so distinct
+            # prompts can't grow the dict for the life of the worker
+            for k in [k for k, (expires, _) in _llm_cache.items() if expires <= now]:
+                del _llm_cache[k]
+            while len(_llm_cache) >= _LLM_CACHE_MAX:
+                del _llm_cache[next(iter(_llm_cache))]
+        _llm_cache[key] = (now + _LLM_CACHE_TTL, response)
+
+
+# Fail fast while OpenRouter is degraded instead of tying up workers for the
+# SDK's default (very long) timeout
+_LLM_TIMEOUT = 30        # seconds per call
+_LLM_FAIL_MAX = 5        # consecutive failures before the circuit opens
+_LLM_RESET_TIMEOUT = 30  # seconds the circuit stays open
+_llm_failures = 0
+_llm_circuit_open_until = 0.0
+
+
+class LLMUnavailableError(Exception):
+    """Raised when the LLM circuit is open."""
+
+
+async def _call_llm(prompt: str, max_tokens: int, stream: bool = False):
+    """Call OpenRouter with a hard timeout and a simple circuit breaker."""
+    global _llm_failures, _llm_circuit_open_until
+    if time.time() < _llm_circuit_open_until:
+        raise LLMUnavailableError("LLM circuit open")
     try:
-        response = llm_client.chat.completions.create(
-            model=LLM_MODEL,
-            max_tokens=max_tokens,
-            messages=[{"role": "user", "content": prompt}]
+        response = await asyncio.wait_for(
+            llm_client.chat.completions.create(
+                model=LLM_MODEL,
+                max_tokens=max_tokens,
+                messages=[{"role": "user", "content": prompt}],
+                stream=stream
+            ),
+            timeout=_LLM_TIMEOUT
         )
-        return response.choices[0].message.content
+    except Exception:
+        _llm_failures += 1
+        if _llm_failures >= _LLM_FAIL_MAX:
+            _llm_circuit_open_until = time.time() + _LLM_RESET_TIMEOUT
+            _llm_failures = 0
+        raise
+    _llm_failures = 0
+    return response
+
+
+async def get_llm_response(prompt: str, max_tokens: int = 1000) -> str:
+    """Get response from LLM via OpenRouter, serving repeat prompts from cache."""
+    key = _llm_cache_key(prompt)
+    try:
+        cached = await _llm_cache_get(key)
+        if cached is not None:
+            return cached
+    except Exception:
+        pass  # a broken cache should never block the request
+
+    try:
+        response = await _call_llm(prompt, max_tokens)
+        text = response.choices[0].message.content
+    except LLMUnavailableError:
+        raise HTTPException(status_code=503, detail="LLM temporarily unavailable")
     except Exception as e:
         return f"Error: {str(e)}"
 
+    try:
+        await _llm_cache_set(key, text)
+    except Exception:
+        pass
+    return text
+
+
+async def stream_llm_response(prompt: str, max_tokens: int = 1000):
+    """Yield LLM response text chunks as they arrive from OpenRouter."""
+    stream = await _call_llm(prompt, max_tokens, stream=True)
+    async for chunk in stream:
+        delta = chunk.choices[0].delta.content
+        if delta:
+            yield delta
+
+
+def sse_response(chunks) -> StreamingResponse:
+    """Wrap an LLM text-chunk generator as a server-sent-event response.
+
+    Each chunk becomes a JSON-encoded `data:` event (EventSource framing;
+    JSON keeps embedded newlines intact). The explicit identity
+    Content-Encoding makes GZipMiddleware pass the stream through untouched -
+    compressed SSE sits in the zlib buffer until a block fills, delaying
+    exactly the early tokens streaming exists to deliver.
+
+    An open circuit is rejected here as a plain 503, before any stream
+    bytes go out; failures after the 200 has been sent surface as a
+    terminal `event: error` frame rather than an unexplained aborted body.
+    """
+    if time.time() < _llm_circuit_open_until:
+        raise HTTPException(status_code=503, detail="LLM temporarily unavailable")
+
+    async def frames():
+        try:
+            async for chunk in chunks:
+                yield f"data: {json.dumps(chunk)}\n\n"
+        except LLMUnavailableError:
+            yield f"event: error\ndata: {json.dumps('LLM temporarily unavailable')}\n\n"
+        except Exception as e:
+            yield f"event: error\ndata: {json.dumps(str(e))}\n\n"
+
+    return StreamingResponse(
+        frames(), media_type="text/event-stream",
+        headers={"Content-Encoding": "identity", "Cache-Control": "no-cache"},
+    )
+
 
 # ============== API Endpoints ==============
 
@@ -149,119 +559,93 @@ async def get_logo():
     return FileResponse("Logo.png", media_type="image/png")
 
 
-@app.get("/api/filters")
-async def get_filters():
-    """Get available filter options (nationalities, teams)."""
-    nationalities = run_query("""
-        MATCH (p:Player)
-        WHERE p.nationality IS NOT NULL AND p.nationality <> ''
-        RETURN DISTINCT p.nationality AS nationality
-        ORDER BY nationality
-    """)
+_FILTERS = None
+_FILTERS_REFRESH = 300  # seconds
 
-    teams = run_query("""
-        MATCH (t:Team)
-        WHERE t.name IS NOT NULL
-        RETURN t.id AS id, t.name AS name
-        ORDER BY name
-    """)
+
+async def _load_filters():
+    """Build the /api/filters payload from Neo4j in a single round-trip."""
+    record = (await run_query(_Q_FILTERS))[0]
 
     # Add sofascore_id to teams
-    teams_with_ss = [add_team_sofascore_id(t) for t in teams]
+    teams = sorted(record["teams"], key=lambda t: t["name"])
+    teams_with_ss = add_team_sofascore_ids(teams)
 
     return {
-        "nationalities": [n["nationality"] for n in nationalities],
+        "nationalities": sorted(record["nats"]),
         "teams": teams_with_ss
     }
 
 
-@app.get("/api/team/{team_id}/squad")
-async def get_team_squad(team_id: int):
-    """Get all players in a team's squad for dropdown selection."""
-    players = run_query("""
-        MATCH (t:Team {id: $team_id})<-[:PLAYS_FOR]-(p:Player)
-        OPTIONAL MATCH (p)-[:HAS_STATS]->(s:Stats)
-        RETURN p.id AS id, p.name AS name, p.age AS age,
-               p.nationality AS nationality, p.market_value AS market_value,
-               p.preferred_positions AS position,
-               s.total_goals AS goals, s.total_assists AS assists,
-               s.total_matches AS matches
-        ORDER BY p.name
-    """, {"team_id": team_id})
-
-    # Add sofascore_id to each player
-    players_with_ss = [add_sofascore_id(p) for p in players]
+async def _filters_refresher():
+    """Keep the filters payload warm so the endpoint is a dict lookup."""
+    global _FILTERS
+    while True:
+        try:
+            _FILTERS = await _load_filters()
+        except Exception as e:
+            print(f"Warning: filters refresh failed: {e}")
+        await asyncio.sleep(_FILTERS_REFRESH)
 
-    return {"players": players_with_ss}
 
+@app.on_event("startup")
+async def start_filters_refresher():
+    asyncio.create_task(_filters_refresher())
 
-@app.post("/api/players/search")
-async def search_players(filters: SearchFilters):
-    """Search players with filters."""
-    conditions = []
-    params = {}
 
-    if filters.position:
-        conditions.append("p.preferred_positions CONTAINS $position")
-        params["position"] = filters.position
+@app.get("/api/filters")
+async def get_filters():
+    """Get available filter options (nationalities, teams)."""
+    global _FILTERS
+    if _FILTERS is None:
+        # First hit before the refresher has run: load once and keep it
+        _FILTERS = await _load_filters()
+    return _FILTERS
 
-    if filters.nationality:
-        conditions.append("p.nationality = $nationality")
-        params["nationality"] = filters.nationality
 
-    if filters.min_age is not None:
-        conditions.append("p.age IS NOT NULL AND p.age >= $min_age")
-        params["min_age"] = filters.min_age
+# Squad rosters change rarely but are fetched on every team selection
+_SQUAD_TTL = 300  # seconds
+_squad_cache = {}  # team_id -> (expires_at, payload)
 
-    if filters.max_age is not None:
-        conditions.append("p.age IS NOT NULL AND p.age <= $max_age")
-        params["max_age"] = filters.max_age
 
-    if filters.team:
-        conditions.append("t.id = $team_id")
-        params["team_id"] = int(filters.team)
+@app.get("/api/team/{team_id}/squad")
+async def get_team_squad(team_id: int, session=Depends(get_session)):
+    """Get all players in a team's squad for dropdown selection."""
+    entry = _squad_cache.get(team_id)
+    if entry and entry[0] > time.time():
+        return entry[1]
 
-    if filters.exclude_team:
-        conditions.append("(t IS NULL OR t.id <> $exclude_team_id)")
-        params["exclude_team_id"] = int(filters.exclude_team)
+    players = await run_query(_Q_TEAM_SQUAD, {"team_id": team_id}, session=session)
 
-    where_clause = "WHERE " + " AND ".join(conditions) if conditions else ""
+    # Add sofascore_id to each player
+    players_with_ss = add_sofascore_ids(players)
 
-    query = f"""
-        MATCH (p:Player)
-        OPTIONAL MATCH (p)-[:PLAYS_FOR]->(t:Team)
-        OPTIONAL MATCH (p)-[:HAS_STATS]->(s:Stats)
-        {where_clause}
-        RETURN p.id AS id, p.name AS name, p.age AS age,
-               p.nationality AS nationality, p.market_value AS market_value,
-               p.preferred_positions AS position, t.name AS team, t.id AS team_id,
-               COALESCE(s.total_goals, 0) AS goals,
-               COALESCE(s.total_assists, 0) AS assists,
-               COALESCE(s.total_matches, 0) AS matches
-        ORDER BY goals DESC
-        LIMIT 50
-    """
+    payload = {"players": players_with_ss}
+    _squad_cache[team_id] = (time.time() + _SQUAD_TTL, payload)
+    return payload
 
-    players = run_query(query, params)
 
-    # Filter by market value (needs parsing)
-    if filters.max_value:
-        def parse_value(v):
-            if not v:
-                return 0
-            v = v.replace("€", "").replace(",", "")
-            if "m" in v.lower():
-                return float(v.lower().replace("m", "")) * 1000000
-            if "k" in v.lower():
-                return float(v.lower().replace("k", "")) * 1000
-            return float(v) if v else 0
+@app.post("/api/players/search")
+async def search_players(filters: SearchFilters, session=Depends(get_session)):
+    """Search players with filters."""
+    params = {
+        "position": filters.position or None,
+        "nationality": filters.nationality or None,
+        "min_age": filters.min_age,
+        "max_age": filters.max_age,
+        "max_value": filters.max_value,
+        "team_id": int(filters.team) if filters.team else None,
+        "exclude_team_id": int(filters.exclude_team) if filters.exclude_team else None,
+        "offset": filters.offset,
+        "limit": filters.limit
+    }
 
-        players = [p for p in players if parse_value(p.get("market_value")) <= filters.max_value]
+    players = await run_query(_Q_SEARCH, params, session=session)
 
     # Add sofascore_id to each player
-    players_with_ss = [add_sofascore_id(p) for p in players]
+    players_with_ss = add_sofascore_ids(players)
 
-    return {"players": players_with_ss}
+    return {"players": players_with_ss, "next_offset": filters.offset + len(players_with_ss)}
 
 
 @app.post("/api/compare")
@@ -272,93 +656,60 @@ async def compare_players(request: CompareRequest):
 
     p1, p2 = request.players
 
-    context = f"""
-    Player 1: {p1.get('name')}
-    - Position: {p1.get('position')}
-    - Age: {p1.get('age')}
-    - Nationality: {p1.get('nationality')}
-    - Market Value: {p1.get('market_value')}
-    - Goals: {p1.get('goals', 0)}
-    - Assists: {p1.get('assists', 0)}
-    - Matches: {p1.get('matches', 0)}
-
-    Player 2: {p2.get('name')}
-    - Position: {p2.get('position')}
-    - Age: {p2.get('age')}
-    - Nationality: {p2.get('nationality')}
-    - Market Value: {p2.get('market_value')}
-    - Goals: {p2.get('goals', 0)}
-    - Assists: {p2.get('assists', 0)}
-    - Matches: {p2.get('matches', 0)}
-    """
-
-    prompt = f"""You are a football analyst helping a team manager decide on a transfer.
-
-{context}
+    def player_block(label, p):
+        return prompts.PLAYER_BLOCK_TMPL.substitute(
+            label=label, name=p.get('name'), position=p.get('position'),
+            age=p.get('age'), nationality=p.get('nationality'),
+            market_value=p.get('market_value'), goals=p.get('goals', 0),
+            assists=p.get('assists', 0), matches=p.get('matches', 0)
+        )
 
-Compare these players and provide:
-1. <strong>Statistical Comparison</strong>: Goals, assists, goal contributions per match
-2. <strong>Value Analysis</strong>: Is the price fair for what you get?
-3. <strong>Age & Potential</strong>: Who has more years ahead? Room to grow?
-4. <strong>Recommendation</strong>: Which player would you sign and why?
+    context = player_block(1, p1) + "\n\n" + player_block(2, p2)
+    prompt = prompts.COMPARE_TMPL.substitute(context=context)
 
-Keep it concise (4-5 paragraphs). Use <strong> tags for headers."""
+    if request.stream:
+        return sse_response(stream_llm_response(prompt))
 
-    analysis = get_llm_response(prompt)
+    analysis = await get_llm_response(prompt)
     return {"analysis": analysis}
 
 
 @app.post("/api/scout")
 async def scout_players(request: ScoutRequest):
     """AI-powered transfer scouting."""
-    # Get team context if provided
+    position_map = {
+        "Goalkeeper": "Goalkeeper",
+        "Defender": "Back",
+        "Midfielder": "Midfield",
+        "Forward": "Forward"
+    }
+    mapped_position = position_map.get(request.position, request.position) if request.position else None
+
+    # Fetch team context (if requested) and candidates concurrently
+    team_coro = run_query(
+        _Q_SCOUT_TEAM_CONTEXT, {"team_id": int(request.team)}
+    ) if request.team else _noop_query()
+
+    # Candidate query is static so the server-side plan cache always hits
+    candidates_coro = run_query(_Q_SCOUT_CANDIDATES, {
+        "position": mapped_position,
+        "team_id": int(request.team) if request.team else None
+    })
+
+    team_data, candidates = await asyncio.gather(team_coro, candidates_coro)
+
+    # Single join per block instead of repeated str concatenation (O(N) not O(N^2))
     team_context = ""
-    if request.team:
-        team_data = run_query("""
-            MATCH (t:Team {id: $team_id})<-[:PLAYS_FOR]-(p:Player)
-            OPTIONAL MATCH (p)-[:HAS_STATS]->(s:Stats)
-            RETURN t.name AS team_name, collect({
-                name: p.name,
-                position: p.preferred_positions,
-                age: p.age,
-                goals: s.total_goals
-            }) AS players
-        """, {"team_id": int(request.team)})
-
-        if team_data:
-            team_context = f"Current squad of {team_data[0]['team_name']}:\n"
-            for p in team_data[0]['players'][:10]:
-                team_context += f"- {p['name']} ({p['position']}), Age: {p['age']}, Goals: {p.get('goals', 0)}\n"
-
-    # Get candidate players (exclude current team)
-    position_filter = ""
-    if request.position:
-        position_map = {
-            "Goalkeeper": "Goalkeeper",
-            "Defender": "Back",
-            "Midfielder": "Midfield",
-            "Forward": "Forward"
-        }
-        position_filter = f"AND p.preferred_positions CONTAINS '{position_map.get(request.position, request.position)}'"
-
-    team_filter = ""
-    if request.team:
-        team_filter = f"AND (t IS NULL OR t.id <> {int(request.team)})"
-
-    candidates = run_query(f"""
-        MATCH (p:Player)-[:HAS_STATS]->(s:Stats)
-        OPTIONAL MATCH (p)-[:PLAYS_FOR]->(t:Team)
-        WHERE p.market_value IS NOT NULL {position_filter} {team_filter}
-        RETURN p.name AS name, p.age AS age, p.nationality AS nationality,
-               p.preferred_positions AS position, p.market_value AS market_value,
-               s.total_goals AS goals, s.total_assists AS assists, t.name AS team
-        ORDER BY s.total_goals DESC
-        LIMIT 15
-    """)
-
-    candidates_text = "Available players in the market:\n"
-    for c in candidates:
-        candidates_text += f"- {c['name']} ({c['position']}), Age: {c['age']}, Team: {c.get('team', 'Free')}, Value: {c['market_value']}, Goals: {c['goals']}, Assists: {c['assists']}\n"
+    if team_data:
+        team_context = f"Current squad of {team_data[0]['team_name']}:\n" + "\n".join(
+            f"- {p['name']} ({p['position']}), Age: {p['age']}, Goals: {p['goals'] or 0}"
+            for p in team_data[0]['players'][:10]
+        )
+
+    candidates_text = "Available players in the market:\n" + "\n".join(
+        f"- {c['name']} ({c['position']}), Age: {c['age']}, Team: {c['team'] or 'Free'}, Value: {c['market_value']}, Goals: {c['goals']}, Assists: {c['assists']}"
+        for c in candidates
+    )
 
     priority_desc = {
         "goals": "prioritize goal scorers",
@@ -367,99 +718,99 @@ async def scout_players(request: ScoutRequest):
         "potential": "prioritize young talent with growth potential"
     }
 
-    prompt = f"""You are a football transfer scout advising a team manager.
+    prompt = prompts.SCOUT_TMPL.substitute(
+        team_context=team_context,
+        candidates_text=candidates_text,
+        budget=request.budget or 'unlimited',
+        priority=priority_desc.get(request.priority, 'overall quality')
+    )
 
-{team_context}
+    if request.stream:
+        return sse_response(stream_llm_response(prompt))
 
-{candidates_text}
+    recommendation = await get_llm_response(prompt)
+    return {"recommendation": recommendation}
 
-Budget: Up to €{request.budget or 'unlimited'}
-Priority: {priority_desc.get(request.priority, 'overall quality')}
 
-Recommend the TOP 3 players to sign. For each:
-1. <strong>Why they fit</strong>: How they improve the squad
-2. <strong>Value assessment</strong>: Is the price fair?
-3. <strong>Concerns</strong>: Any risks (age, form, etc.)
+@app.get("/api/team/{team_id}/summary")
+async def get_team_summary(team_id: int, session=Depends(get_session)):
+    """Lightweight team aggregates without the squad list or AI analysis."""
+    team_data = await run_query(_Q_TEAM_META, {"team_id": team_id}, session=session)
+    if not team_data:
+        raise HTTPException(status_code=404, detail="Team not found")
 
-Use <strong> tags for player names. Be specific and concise."""
+    data = team_data[0]
+    total_value = data.get("total_value_eur") or 0
+    total_value_str = f"€{total_value/1000000:.1f}M" if total_value >= 1000000 else f"€{total_value/1000:.0f}k"
+    return {
+        "team_name": data["team_name"],
+        "team_id": data["team_id"],
+        "sofascore_id": TEAM_SOFASCORE_MAP.get(team_id),
+        "player_count": data["player_count"],
+        "avg_age": data["avg_age"] or 0,
+        "total_value": total_value_str,
+        "total_goals": data["total_goals"] or 0
+    }
 
-    recommendation = get_llm_response(prompt)
-    return {"recommendation": recommendation}
+
+@app.get("/api/team/{team_id}/players")
+async def get_team_players(team_id: int, limit: int = 25, offset: int = 0,
+                           session=Depends(get_session)):
+    """Paginated squad list (top scorers first) without the AI analysis."""
+    players = await run_query(
+        _Q_TEAM_PLAYERS,
+        {"team_id": team_id, "player_limit": limit, "offset": offset},
+        session=session
+    )
+    return {"players": add_sofascore_ids(players), "next_offset": offset + len(players)}
 
 
 @app.get("/api/team/{team_id}")
-async def analyze_team(team_id: int):
-    """Get team analysis."""
-    # Get team stats
-    team_data = run_query("""
-        MATCH (t:Team {id: $team_id})<-[:PLAYS_FOR]-(p:Player)
-        OPTIONAL MATCH (p)-[:HAS_STATS]->(s:Stats)
-        RETURN t.name AS team_name, t.id AS team_id,
-               count(p) AS player_count,
-               avg(p.age) AS avg_age,
-               sum(s.total_goals) AS total_goals,
-               collect({
-                   id: p.id,
-                   name: p.name,
-                   position: p.preferred_positions,
-                   age: p.age,
-                   nationality: p.nationality,
-                   market_value: p.market_value,
-                   goals: s.total_goals,
-                   assists: s.total_assists,
-                   matches: s.total_matches
-               }) AS players
-    """, {"team_id": team_id})
+async def analyze_team(team_id: int, player_limit: int = 15, stream: bool = False):
+    """Get team analysis. With ?stream=true only the AI analysis is
+    returned, as server-sent events."""
+    # Fetch aggregates and the (capped) squad list concurrently
+    team_data, squad = await asyncio.gather(
+        run_query(_Q_TEAM_META, {"team_id": team_id}),
+        run_query(_Q_TEAM_PLAYERS, {"team_id": team_id, "player_limit": player_limit, "offset": 0})
+    )
 
     if not team_data:
         raise HTTPException(status_code=404, detail="Team not found")
 
     data = team_data[0]
+    data["players"] = squad
 
-    # Calculate total value
-    def parse_value(v):
-        if not v:
-            return 0
-        v = str(v).replace("€", "").replace(",", "")
-        if "m" in v.lower():
-            return float(v.lower().replace("m", "")) * 1000000
-        if "k" in v.lower():
-            return float(v.lower().replace("k", "")) * 1000
-        return 0
-
-    total_value = sum(parse_value(p.get("market_value")) for p in data["players"])
+    # Total value is aggregated server-side over the full squad; fall back to
+    # parsing the returned players if market_value_eur hasn't been loaded yet
+    total_value = data.get("total_value_eur") or sum(parse_value(p.get("market_value")) for p in data["players"])
     total_value_str = f"€{total_value/1000000:.1f}M" if total_value >= 1000000 else f"€{total_value/1000:.0f}k"
 
     # Add sofascore_id to each player
-    players_with_ss = [add_sofascore_id(p) for p in data["players"]]
+    players_with_ss = add_sofascore_ids(data["players"])
 
     # Get team sofascore_id
     team_sofascore_id = TEAM_SOFASCORE_MAP.get(team_id)
 
     # Generate AI analysis
-    players_text = "\n".join([
-        f"- {p['name']} ({p['position']}), Age: {p['age']}, Goals: {p.get('goals', 0)}, Assists: {p.get('assists', 0)}"
-        for p in data["players"][:15]
-    ])
-
-    prompt = f"""Analyze this football squad:
+    players_text = "\n".join(
+        f"- {p['name']} ({p['position']}), Age: {p['age']}, Goals: {p['goals'] or 0}, Assists: {p['assists'] or 0}"
+        for p in data["players"]
+    )
 
-Team: {data['team_name']}
-Players: {data['player_count']}
-Average Age: {data['avg_age']:.1f}
-Total Goals: {data['total_goals']}
+    prompt = prompts.TEAM_TMPL.substitute(
+        team_name=data['team_name'],
+        player_count=data['player_count'],
+        avg_age=f"{data['avg_age']:.1f}",
+        total_goals=data['total_goals'],
+        players_text=players_text
+    )
 
-Squad:
-{players_text}
+    if stream:
+        # Tokens render as they arrive instead of waiting for the full analysis
+        return sse_response(stream_llm_response(prompt))
 
-Provide:
-1. <strong>Squad Strengths</strong>: What positions are well-covered
-2. <strong>Areas to Improve</strong>: Where reinforcements are needed
-3. <strong>Transfer Priorities</strong>: Top 2-3 signing recommendations
-
-Use <strong> for emphasis. Be concise (3 paragraphs)."""
-
-    analysis = get_llm_response(prompt)
+    analysis = await get_llm_response(prompt)
 
     return {
         "team_name": data["team_name"],
@@ -478,18 +829,52 @@ Use <strong> for emphasis. Be concise (3 paragraphs)."""
 async def chat(request: ChatRequest):
     """Chat with the AI using GraphRAG - can answer any football question."""
     try:
-        # Add team context to the question if team_id is provided
         question = request.message
+        user_message = request.message.lower()
+
+        await get_teams_cached()
+
+        # Batch all independent context lookups into one concurrent round-trip
+        tasks = {}
         if request.team_id:
-            team_data = run_query("""
-                MATCH (t:Team {id: $team_id})
-                RETURN t.name AS name
-            """, {"team_id": request.team_id})
-            if team_data:
-                question = f"[Context: User manages {team_data[0]['name']}] {request.message}"
-
-        # Use GraphRAG to answer
-        response = graph_chain.invoke({"query": question})
+            tasks["team"] = run_query(_Q_TEAM_NAME, {"team_id": request.team_id})
+        intents = {m.lastgroup for m in INTENT_RE.finditer(user_message)}
+        if "scorer" in intents:
+            tasks["scorers"] = run_query(_Q_TOP_SCORERS)
+        if "young" in intents:
+            tasks["young"] = run_query(_Q_YOUNG_TALENTS)
+
+        results = dict(zip(tasks.keys(), await asyncio.gather(*tasks.values())))
+
+        # Build context from whatever lookups were relevant
+        context_parts = []
+        if results.get("team"):
+            context_parts.append(f"User manages {results['team'][0]['name']}")
+        else:
+            # Detect a team mentioned by name in the message (cached, single pass)
+            mentioned = find_mentioned_team(user_message)
+            if mentioned:
+                context_parts.append(f"User is asking about {mentioned['name']}")
+        if "scorers" in results:
+            scorers = ", ".join(f"{p['name']} ({p['goals']} goals)" for p in results["scorers"])
+            context_parts.append(f"Top scorers: {scorers}")
+        if "young" in results:
+            young = ", ".join(f"{p['name']} (age {p['age']})" for p in results["young"])
+            context_parts.append(f"Young talents: {young}")
+
+        if context_parts:
+            question = f"[Context: {'; '.join(context_parts)}] {request.message}"
+
+        if request.stream:
+            # Streaming bypasses the (non-streaming) GraphRAG chain and answers
+            # directly from the LLM using the gathered graph context
+            prompt = prompts.CHAT_STREAM_TMPL.substitute(question=question)
+            return sse_response(stream_llm_response(prompt))
+
+        # Use GraphRAG to answer. The LangChain chain is synchronous (sync
+        # neo4j driver + sync LLM client), so run it in a worker thread to
+        # keep the event loop free for other requests.
+        response = await asyncio.to_thread(get_chain().invoke, {"query": question})
         return {"response": response["result"]}
 
     except Exception as e:
@@ -497,25 +882,13 @@ async def chat(request: ChatRequest):
         print(f"GraphRAG error: {e}")
 
         # Get some basic context
-        general = run_query("""
-            MATCH (p:Player)
-            OPTIONAL MATCH (p)-[:HAS_STATS]->(s:Stats)
-            RETURN count(DISTINCT p) AS total_players,
-                   avg(p.age) AS avg_age,
-                   sum(s.total_goals) AS total_goals
-        """)
+        general = await run_query(_Q_GENERAL_STATS)
 
         context = f"Database has {general[0]['total_players']} players."
 
-        prompt = f"""You are a football analytics AI assistant.
-
-{context}
+        prompt = prompts.CHAT_FALLBACK_TMPL.substitute(context=context, message=request.message)
 
-User question: {request.message}
-
-Provide a helpful response. If you need specific data, suggest what the user should ask for."""
-
-        response = get_llm_response(prompt)
+        response = await get_llm_response(prompt)
         return {"response": response}
 
 
@@ -523,45 +896,62 @@ Provide a helpful response. If you need specific data, suggest what the user sho
 import httpx
 from fastapi.responses import Response
 
-@app.get("/api/player-image/{sofascore_id}")
-async def get_player_image(sofascore_id: int):
-    """Proxy SofaScore player images to avoid CORS."""
+# Images are immutable per sofascore_id, so cache the bytes for a day
+_IMAGE_TTL = 86400  # seconds
+_image_cache = {}  # (kind, sofascore_id) -> (expires_at, bytes)
+
+# One shared client: connections to api.sofascore.com stay warm instead of
+# paying DNS + TLS handshake on every image
+sofascore_client = httpx.AsyncClient(
+    http2=True,
+    timeout=5.0,
+    limits=httpx.Limits(max_keepalive_connections=32, max_connections=64),
+    headers={"User-Agent": "Mozilla/5.0"}
+)
+
+# Let the browser cache images too, so warm pages never re-hit the proxy
+_IMAGE_HEADERS = {"Cache-Control": "public, max-age=86400"}
+
+
+@app.on_event("shutdown")
+async def close_sofascore_client():
+    await sofascore_client.aclose()
+
+
+async def _proxy_sofascore_image(kind: str, sofascore_id: int):
+    """Fetch (or serve from cache) a SofaScore player/team image."""
+    cache_key = (kind, sofascore_id)
+    entry = _image_cache.get(cache_key)
+    if entry and entry[0] > time.time():
+        return Response(content=entry[1], media_type="image/png", headers=_IMAGE_HEADERS)
+
     try:
-        async with httpx.AsyncClient() as client:
-            response = await client.get(
-                f"https://api.sofascore.com/api/v1/player/{sofascore_id}/image",
-                headers={"User-Agent": "Mozilla/5.0"},
-                timeout=5.0
+        response = await sofascore_client.get(
+            f"https://api.sofascore.com/api/v1/{kind}/{sofascore_id}/image"
+        )
+        if response.status_code == 200:
+            _image_cache[cache_key] = (time.time() + _IMAGE_TTL, response.content)
+            return Response(
+                content=response.content,
+                media_type="image/png",
+                headers=_IMAGE_HEADERS
             )
-            if response.status_code == 200:
-                return Response(
-                    content=response.content,
-                    media_type="image/png"
-                )
     except:
         pass
     # Return empty/placeholder on error
     raise HTTPException(status_code=404, detail="Image not found")
 
 
+@app.get("/api/player-image/{sofascore_id}")
+async def get_player_image(sofascore_id: int):
+    """Proxy SofaScore player images to avoid CORS."""
+    return await _proxy_sofascore_image("player", sofascore_id)
+
+
 @app.get("/api/team-image/{sofascore_id}")
 async def get_team_image(sofascore_id: int):
     """Proxy SofaScore team images."""
-    try:
-        async with httpx.AsyncClient() as client:
-            response = await client.get(
-                f"https://api.sofascore.com/api/v1/team/{sofascore_id}/image",
-                headers={"User-Agent": "Mozilla/5.0"},
-                timeout=5.0
-            )
-            if response.status_code == 200:
-                return Response(
-                    content=response.content,
-                    media_type="image/png"
-                )
-    except:
-        pass
-    raise HTTPException(status_code=404, detail="Image not found")
+    return await _proxy_sofascore_image("team", sofascore_id)
 
 
 # Mount static files (create if needed)
@@ -573,4 +963,13 @@ except:
 
 if __name__ == "__main__":
     import uvicorn
-    uvicorn.run(app, host="127.0.0.1", port=8000)
+    # With multiple workers the in-process caches are per-worker; set REDIS_URL
+    # to keep the LLM cache coherent across them.
+    uvicorn.run(
+        "app:app",
+        host="127.0.0.1",
+        port=8000,
+        workers=int(os.getenv("WEB_CONCURRENCY", os.cpu_count() or 1)),
+        loop="uvloop",
+        http="httptools"
+    )
@@ -0,0 +1,124 @@
+"""
+Build Transfermarkt -> SofaScore ID mappings by fuzzy-matching names.
+
+Writes tm_sofascore_mapping.csv (players) and tm_sofascore_team_mapping.csv
+(teams), which app.py loads at startup to resolve SofaScore image IDs.
+
+Requirements:
+    pip install pandas numpy rapidfuzz pyarrow
+
+Usage:
+    python build_sofascore_mapping.py
+"""
+
+import unicodedata
+
+import numpy as np
+import pandas as pd
+import pyarrow.feather as feather
+from rapidfuzz import process, fuzz
+
+SCORE_CUTOFF = 75  # minimum fuzz.ratio (0-100) to accept a match
+
+
+def normalize_name(name) -> str:
+    """Lowercase, strip accents, and collapse whitespace.
+
+    Reference implementation of the per-element logic; the pipeline itself
+    uses the vectorized normalize_names below.
+    """
+    if not isinstance(name, str):
+        return ""
+    name = unicodedata.normalize("NFKD", name)
+    name = name.encode("ascii", "ignore").decode("ascii")
+    return " ".join(name.lower().split())
+
+
+def normalize_names(series: pd.Series) -> list:
+    """Vectorized normalize_name over a whole name column."""
+    return (
+        series.fillna("").astype(str)
+        .str.normalize("NFKD")
+        .str.encode("ascii", "ignore").str.decode("ascii")
+        .str.lower()
+        .str.split().str.join(" ")
+        .tolist()
+    )
+
+
+def _block_keys(name: str):
+    """Blocking keys for one normalized name: first two letters, plus the
+    first three letters of the (alphabetically) last token for recall on
+    reordered or shortened names."""
+    keys = set()
+    if name:
+        keys.add(name[:2])
+        keys.add(sorted(name.split())[-1][:3])
+    return keys
+
+
+def build_mapping(tm_df: pd.DataFrame, ss_df: pd.DataFrame, out_path: str) -> pd.DataFrame:
+    """Match each Transfermarkt row to its best SofaScore row by name."""
+    tm_names = normalize_names(tm_df["name"])
+    ss_names = normalize_names(ss_df["name"])
+
+    # Blocking pass: only names sharing a key are scored at all, so the work
+    # is near O(N) over realistic rosters instead of the full NxM matrix
+    blocks = {}
+    for j, name in enumerate(ss_names):
+        for key in _block_keys(name):
+            blocks.setdefault(key, []).append(j)
+
+    best_idx = np.zeros(len(tm_names), dtype=np.intp)
+    best_score = np.zeros(len(tm_names))
+    for i, name in enumerate(tm_names):
+        candidates = set()
+        for key in _block_keys(name):
+            candidates.update(blocks.get(key, ()))
+        if not candidates:
+            continue
+        candidates = list(candidates)
+        # RapidFuzz scores the candidate block in C
+        match = process.extractOne(
+            name, [ss_names[j] for j in candidates],
+            scorer=fuzz.ratio, score_cutoff=SCORE_CUTOFF
+        )
+        if match:
+            best_idx[i] = candidates[match[2]]
+            best_score[i] = match[1]
+    matched = best_score > 0
+
+    ss_best = ss_df.iloc[best_idx].reset_index(drop=True)
+    out = pd.DataFrame({
+        "tm_id": tm_df["id"].to_numpy(),
+        "tm_name": tm_df["name"].to_numpy(),
+        "sofascore_id": np.where(matched, ss_best["id"].to_numpy(), np.nan),
+        "sofascore_name": np.where(matched, ss_best["name"].to_numpy(), None),
+        "match_score": np.round(best_score / 100.0, 2)
+    })
+    out.to_csv(out_path, index=False)
+    # Feather twin for app.py: loads memory-mapped, no CSV parse at startup
+    feather.write_feather(
+        out.dropna(subset=["sofascore_id"])[["tm_id", "sofascore_id"]].astype("int64"),
+        out_path.replace(".csv", ".feather")
+    )
+    print(f"Wrote {out_path}: {int(matched.sum())}/{len(out)} matched")
+    return out
+
+
+def main():
+    tm_players = pd.read_csv("tm_nodes/players.csv", engine="pyarrow")
+    ss_players = pd.read_csv("nodes/players.csv", engine="pyarrow").drop_duplicates(subset=["id"])
+    build_mapping(tm_players, ss_players, "tm_sofascore_mapping.csv")
+
+    try:
+        tm_teams = pd.read_csv("tm_nodes/teams.csv", engine="pyarrow")
+    except FileNotFoundError:
+        print("Warning: tm_nodes/teams.csv not found, skipping team mapping")
+        return
+    ss_teams = pd.read_csv("nodes/teams.csv", engine="pyarrow").drop_duplicates(subset=["id"])
+    build_mapping(tm_teams, ss_teams, "tm_sofascore_team_mapping.csv")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,9 +1,19 @@
-import requests
-from bs4 import BeautifulSoup
-import time
+import aiohttp
+import asyncio
+import atexit
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from selectolax.lexbor import LexborHTMLParser
 import os
 import random
 import re
+import sqlite3
+
+# Optional: persistent on-disk HTTP cache so warm reruns skip the network
+try:
+    from aiohttp_client_cache import CachedSession, SQLiteBackend
+except ImportError:
+    CachedSession = None
 
 # --- SCRIPT SETTINGS ---
 TEST_ONE_TEAM_ONLY = False  
@@ -14,16 +24,57 @@ REL_DIR = "tm_relationships/"
 os.makedirs(NODE_DIR, exist_ok=True)
 os.makedirs(REL_DIR, exist_ok=True)
 
+# Legacy per-line checkpoints, imported into the SQLite state DB on startup
 PROCESSED_TEAMS_FILE = "tm_processed_teams.txt"
 PROCESSED_PLAYERS_FILE = "tm_processed_players.txt"
 
+STATE_DB = "tm_state.db"
+
 HEADERS = {
     "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36",
-    "Accept-Language": "en-US,en;q=0.9"
+    "Accept-Language": "en-US,en;q=0.9",
+    # aiohttp decompresses transparently; gzip pages are ~5x smaller on the wire
+    "Accept-Encoding": "gzip, deflate"
 }
 
 BASE_URL = "https://www.transfermarkt.com"
 
+MANAGER_LABELS = ("Manager:", "Trainer:", "Head Coach:", "Coach:")
+
+async def _no_page():
+    """Placeholder awaitable for pages we decide not to fetch."""
+    return None
+
+def _extract_age(text):
+    """Age from a 'Jun 24, 1987 (38)' sidebar value; str ops beat a regex here."""
+    start = text.rfind('(')
+    end = text.rfind(')')
+    if 0 <= start < end:
+        inner = text[start + 1:end].strip()
+        if inner.isdigit():
+            return inner
+    return ""
+
+def _extract_year(text):
+    """First '2023' or '22/23' shaped token in an achievement row."""
+    for tok in text.split():
+        tok = tok.strip('.,()')
+        if len(tok) == 4 and tok.isdigit():
+            return tok
+        if len(tok) == 5 and tok[2] == '/' and tok[:2].isdigit() and tok[3:].isdigit():
+            return tok
+    return ""
+
+# Contract dates stay on regex: the formats genuinely vary (12.07.2023 vs
+# "Jul 12, 2023"). Everything simpler is handled with plain string ops below.
+_DATE_PATTERN = r'(\d{2}[/.]\d{2}[/.]\d{4})|(\w{3} \d{1,2}, \d{4})'
+_RE_EXPIRES = re.compile(r'Contract expires[:\s]+.*?(' + _DATE_PATTERN + r')')
+_RE_JOINED = re.compile(r'Joined[:\s]+.*?(' + _DATE_PATTERN + r')')
+
+# Bounded concurrency: overlap the network waits without hammering the host
+MAX_CONCURRENCY = 10
+REQUEST_TIMEOUT = aiohttp.ClientTimeout(total=15)
+
 LEAGUES = {
     "Botola Pro": {"url": "/botola-pro-inwi/startseite/wettbewerb/MAR1", "country": "Morocco"},
     "Premier League": {"url": "/premier-league/startseite/wettbewerb/GB1", "country": "England"},
@@ -34,43 +85,132 @@ LEAGUES = {
 }
 
 # --- Helpers ---
-def get_soup(url_path):
+MAX_RETRIES = 5
+
+# Tree construction is the CPU-heavy part of a response; Lexbor releases the
+# GIL while parsing, so a thread pool keeps the event loop reading sockets
+_PARSE_POOL = ThreadPoolExecutor(max_workers=os.cpu_count() or 2, thread_name_prefix="parse")
+
+async def get_soup(session, url_path):
     full_url = f"{BASE_URL}{url_path}" if not url_path.startswith("http") else url_path
-    time.sleep(random.uniform(0.6, 1.2)) 
-    try:
-        response = requests.get(full_url, headers=HEADERS, timeout=15)
-        if response.status_code == 200:
-            return BeautifulSoup(response.content, "html.parser")
-        elif response.status_code == 429:
-            print("  ⚠️ Rate limit! Sleeping 60s...")
-            time.sleep(60)
-            return get_soup(url_path)
-    except: return None
+    for attempt in range(MAX_RETRIES):
+        await asyncio.sleep(random.uniform(0.6, 1.2))
+        try:
+            async with session.get(full_url, headers=HEADERS, timeout=REQUEST_TIMEOUT) as response:
+                if response.status == 200:
+                    # A non-HTML 200 is a WAF challenge or error page; parsing
+                    # it would only yield rows full of empty fields
+                    if 'html' not in response.headers.get('Content-Type', ''):
+                        print(f"  ⚠️ Non-HTML response for {full_url}, skipping")
+                        return None
+                    body = await response.read()
+                    return await asyncio.get_running_loop().run_in_executor(
+                        _PARSE_POOL, LexborHTMLParser, body)
+                if response.status in (429, 503):
+                    # Sleep as long as the server asks, else back off exponentially
+                    retry_after = response.headers.get('Retry-After')
+                    try:
+                        wait = float(retry_after)
+                    except (TypeError, ValueError):
+                        wait = 2 ** attempt
+                    print(f"  ⚠️ HTTP {response.status}, retrying in {wait:.0f}s...")
+                    await asyncio.sleep(wait + random.uniform(0, 0.5))
+                    continue
+                return None
+        except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+            print(f"  ⚠️ Request failed for {full_url}: {e}")
+            return None
     return None
 
 def clean_str(val):
     if val is None: return ""
-    val = re.sub(r'^#\d+\s*', '', str(val))
-    return f'"{str(val).strip().replace('"', '""')}"'
+    s = str(val).strip()
+    if s.startswith('#'):
+        i = 1
+        while i < len(s) and s[i].isdigit(): i += 1
+        if i > 1: s = s[i:].lstrip()
+    if '"' in s: s = s.replace('"', '""')
+    return f'"{s}"'
 
 def clean_val(val):
     if val is None: return "0"
-    val = str(val).strip()
+    val = str(val)
+    if val.isdigit(): return val  # fast path: plain numbers need no cleanup
+    val = val.strip()
     val = val.replace("'", "").replace(".", "") # Remove minutes ' and dots
     if val in ["-", "", "None"]: return "0"
     if "/" in val: return val # Return slash strings as-is
-    if not val.replace('-', '').isdigit(): return "0" 
+    if not val.replace('-', '').isdigit(): return "0"
     return val
 
-def load_ids(f):
-    if not os.path.exists(f): return set()
-    with open(f, 'r') as file: return {line.strip() for line in file if line.strip()}
-
-def save_id(f, i):
-    with open(f, 'a') as file: file.write(f"{i}\n")
+# Processed-id checkpoint: one WAL-mode SQLite DB with batched commits
+# instead of a file open + append + close per scraped entity
+_state_conn = sqlite3.connect(STATE_DB)
+_state_conn.execute("PRAGMA journal_mode=WAL")
+_state_conn.execute("PRAGMA synchronous=NORMAL")
+_state_conn.execute(
+    "CREATE TABLE IF NOT EXISTS processed (kind TEXT, id TEXT, "
+    "PRIMARY KEY (kind, id)) WITHOUT ROWID"
+)
+atexit.register(_state_conn.commit)
+
+_COMMIT_EVERY = 100
+_pending_saves = 0
+
+def load_ids(kind, legacy_file=None):
+    if legacy_file and os.path.exists(legacy_file):
+        with open(legacy_file, 'r') as file:
+            rows = [(kind, line.strip()) for line in file if line.strip()]
+        _state_conn.executemany("INSERT OR IGNORE INTO processed VALUES (?, ?)", rows)
+        _state_conn.commit()
+    return {r[0] for r in _state_conn.execute("SELECT id FROM processed WHERE kind = ?", (kind,))}
+
+def save_id(kind, i):
+    global _pending_saves
+    _state_conn.execute("INSERT OR IGNORE INTO processed VALUES (?, ?)", (kind, str(i)))
+    _pending_saves += 1
+    if _pending_saves >= _COMMIT_EVERY:
+        # Flush buffered CSV rows before their ids become durable: committing
+        # first would, after a hard kill, leave players marked processed whose
+        # rows never reached disk - skipped forever on resume
+        flush_all()
+        _state_conn.commit()
+        _pending_saves = 0
+
+# Buffered CSV appends: one open/write/close per ~500 rows instead of per row.
+# The event loop is single-threaded, so the buffers need no locking.
+_FLUSH_EVERY = 500
+_BUFFERS = defaultdict(list)
+
+def _flush(path):
+    rows = _BUFFERS[path]
+    if not rows: return
+    with open(path, 'a', encoding='utf-8') as f:
+        f.write("\n".join(rows) + "\n")
+    rows.clear()
+
+def flush_all():
+    for path in list(_BUFFERS):
+        _flush(path)
+
+atexit.register(flush_all)
 
 def save_csv(folder, filename, row):
-    with open(os.path.join(folder, filename), 'a', encoding='utf-8') as f: f.write(row + "\n")
+    path = os.path.join(folder, filename)
+    buf = _BUFFERS[path]
+    buf.append(row)
+    if len(buf) >= _FLUSH_EVERY:
+        _flush(path)
+
+# Entities like countries show up once per player/manager/league; emit each
+# key only once per run instead of writing thousands of duplicate rows
+_EMITTED = defaultdict(set)
+
+def save_csv_unique(folder, filename, key, row):
+    seen = _EMITTED[filename]
+    if key in seen: return
+    seen.add(key)
+    save_csv(folder, filename, row)
 
 # --- Setup ---
 def setup_csv_files():
@@ -119,151 +259,174 @@ def setup_csv_files():
 
 # --- Parsing Logic ---
 
-def get_profile_value(soup, label_list):
-    if isinstance(label_list, str): label_list = [label_list]
-    for label_text in label_list:
-        label = soup.find(string=re.compile(label_text))
+def parse_sidebar(tree):
+    """One pass over the info-table and data header into {label: (value, flag)}.
+
+    Each profile label used to trigger its own full-tree search; this walks the
+    known label nodes once so every later lookup is a dict access.
+    """
+    attrs = {}
+    for span in tree.css('span.info-table__content--regular'):
+        label = span.text(strip=True).rstrip(':')
+        row = span.parent
+        if row is None or not label: continue
+        val = row.css_first('.info-table__content--bold')
+        flag = row.css_first('img.flaggenrahmen')
+        attrs.setdefault(label, (
+            val.text(strip=True) if val is not None else row.text(strip=True),
+            flag.attributes.get('title', '') if flag is not None else ""
+        ))
+    for li in tree.css('li.data-header__label'):
+        row_text = li.text(strip=True)
+        label = row_text.split(':')[0].strip()
         if not label: continue
-        container = label.find_parent('li') or label.find_parent('tr')
-        if container:
-            val = container.find(class_='data-header__content') or \
-                  container.find(class_='info-table__content--bold')
-            if val: return val.get_text(strip=True)
-        parent_span = label.find_parent('span')
-        if parent_span:
-             val = parent_span.find_next_sibling('span', class_='info-table__content--bold')
-             if val: return val.get_text(strip=True)
-    return ""
-
-def scrape_manager_details(manager_url):
-    soup = get_soup(manager_url)
-    if not soup: return None, None
-    age = ""
-    dob_label = soup.find(string=re.compile("Date of birth/Age"))
-    if dob_label:
-        container = dob_label.find_parent('li') or dob_label.find_parent('tr')
-        if container:
-            txt = container.get_text(strip=True)
-            age_match = re.search(r'\((\d+)\)', txt)
-            if age_match: age = age_match.group(1)
-    nat = ""
-    nat_label = soup.find(string=re.compile("Citizenship"))
-    if nat_label:
-        nat_container = nat_label.find_parent('li') or nat_label.find_parent('tr')
-        if nat_container:
-            flag = nat_container.find('img', class_='flaggenrahmen')
-            nat = flag.get('title', '') if flag else ""
+        val = li.css_first('.data-header__content')
+        flag = li.css_first('img.flaggenrahmen')
+        attrs.setdefault(label, (
+            val.text(strip=True) if val is not None else row_text,
+            flag.attributes.get('title', '') if flag is not None else ""
+        ))
+    return attrs
+
+def _sidebar_entry(attrs, label_list):
+    if isinstance(label_list, str): label_list = [label_list]
+    for label in label_list:
+        if label in attrs:
+            return attrs[label]
+    for label in label_list:  # tolerate label variants; the dict is ~15 keys
+        needle = label.lower()
+        for key in attrs:
+            if needle in key.lower():
+                return attrs[key]
+    return ("", "")
+
+def sidebar_value(attrs, label_list):
+    return _sidebar_entry(attrs, label_list)[0]
+
+def sidebar_flag(attrs, label_list):
+    return _sidebar_entry(attrs, label_list)[1]
+
+async def scrape_manager_details(session, manager_url):
+    tree = await get_soup(session, manager_url)
+    if not tree: return None, None
+    attrs = parse_sidebar(tree)
+    age = _extract_age(sidebar_value(attrs, "Date of birth/Age"))
+    nat = sidebar_flag(attrs, "Citizenship")
     return age, nat
 
-def scrape_player(player_url, team_id, processed_players):
+async def scrape_player(session, player_url, team_id, processed_players):
     p_id = player_url.split('/')[-1]
     if p_id in processed_players: return
+    processed_players.add(p_id)  # claim early so concurrent teams don't rescrape
 
-    soup = get_soup(player_url)
-    if not soup: return
+    stats_url = player_url.replace("/profil/", "/leistungsdaten/") + "/plus/1?saison=ges"
+    ach_url = player_url.replace("/profil/", "/erfolge/")
+    inj_url = player_url.replace("/profil/", "/verletzungen/")
+
+    # Profile and stats are always needed: fetch them in one overlapped
+    # round-trip. The player's semaphore slot covers the whole group and the
+    # connector's limit_per_host keeps host politeness intact.
+    tree, s_tree = await asyncio.gather(
+        get_soup(session, player_url),
+        get_soup(session, stats_url)
+    )
+    if not tree: return
+
+    # Only fetch achievements/injuries when the profile shows their tab;
+    # youth-heavy squads skip up to half their player HTTP volume this way
+    a_tree, i_tree = await asyncio.gather(
+        get_soup(session, ach_url) if tree.css_first('a[href*="/erfolge/"]') else _no_page(),
+        get_soup(session, inj_url) if tree.css_first('a[href*="/verletzungen/"]') else _no_page()
+    )
 
     # 1. PROFILE
     try:
-        h1 = soup.find('h1')
+        h1 = tree.css_first('h1')
         if h1:
-            for tag in h1.select('span'): tag.decompose() 
-            name = h1.get_text(" ", strip=True) 
+            for tag in h1.css('span'): tag.decompose()
+            name = h1.text(separator=" ", strip=True)
         else: name = "Unknown"
 
         print(f"    Processing: {name} (ID: {p_id})")
 
-        age = ""
-        dob_label = soup.find(string=re.compile("Date of birth/Age"))
-        if dob_label:
-            container = dob_label.find_parent('li') or dob_label.find_parent('tr')
-            if container:
-                full_text = container.get_text(strip=True)
-                match = re.search(r'\((\d+)\)', full_text)
-                if match: age = match.group(1)
-
-        height = get_profile_value(soup, "Height").replace('m', '').replace(',', '.')
-        foot = get_profile_value(soup, ["Foot", "Main foot", "Strong foot"])
+        attrs = parse_sidebar(tree)
+
+        age = _extract_age(sidebar_value(attrs, "Date of birth/Age"))
+
+        height = sidebar_value(attrs, "Height").replace('m', '').replace(',', '.')
+        foot = sidebar_value(attrs, ["Foot", "Main foot", "Strong foot"])
         if foot: print(f"      [FOOT FOUND] {foot}")
-        pos = get_profile_value(soup, "Position")
-        
-        nat = ""
-        nat_label = soup.find(string=re.compile("Citizenship"))
-        if nat_label:
-            nat_container = nat_label.find_parent('li') or nat_label.find_parent('tr')
-            if nat_container:
-                flag = nat_container.find('img', class_='flaggenrahmen')
-                nat = flag.get('title', '') if flag else ""
-
-        mv_box = soup.find('a', class_='data-header__market-value-wrapper')
-        mv = mv_box.get_text(strip=True).split('Last')[0] if mv_box else ""
+        pos = sidebar_value(attrs, "Position")
+
+        nat = sidebar_flag(attrs, "Citizenship")
+
+        mv_box = tree.css_first('a.data-header__market-value-wrapper')
+        mv = mv_box.text(strip=True).split('Last')[0] if mv_box else ""
 
         save_csv(NODE_DIR, "players.csv", f'{p_id},{clean_str(name)},{clean_val(age)},{clean_str(nat)},None,{clean_val(height)},None,{clean_str(foot)},{clean_str(pos)},{clean_str(mv)},None,None,{team_id}')
         save_csv(REL_DIR, "player_plays_for.csv", f"{p_id},{team_id}")
         if nat:
-            save_csv(NODE_DIR, "countries.csv", clean_str(nat))
+            save_csv_unique(NODE_DIR, "countries.csv", nat, clean_str(nat))
             save_csv(REL_DIR, "player_plays_for_country.csv", f"{p_id},{clean_str(nat)}")
     except Exception as e: print(f"      ❌ Error parsing profile: {e}")
 
     # 2. STATS - Using column positions (different for GK vs outfield players)
     # Outfield: Col2=Matches, Col3=Goals, Col4=Assists, Col8=Yellow, Col9=SecondYellow, Col10=Red
     # GK: Col2=Matches, Col3=-, Col4=Cards(slash-separated), Col5=GoalsConceded, Col6=CleanSheets
-    stats_url = player_url.replace("/profil/", "/leistungsdaten/") + "/plus/1?saison=ges"
-    s_soup = get_soup(stats_url)
-    if s_soup:
-        footer = s_soup.find('tfoot')
-        if footer:
-            row = footer.find('tr')
-            if row:
-                cols = row.find_all('td')
-
-                # Check if player is a Goalkeeper by looking at position
-                is_goalkeeper = pos and ("Goalkeeper" in pos or "keeper" in pos.lower())
-
-                matches = clean_val(cols[2].get_text(strip=True)) if len(cols) > 2 else "0"
-
-                if is_goalkeeper:
-                    # GK table: Col2=Matches, Col7=Yellow, Col8=2ndYellow, Col9=Red, Col10=GoalsConceded, Col11=CleanSheets
-                    goals = "0"
-                    assists = "0"
-                    yellow = clean_val(cols[7].get_text(strip=True)) if len(cols) > 7 else "0"
-                    second_yellow = clean_val(cols[8].get_text(strip=True)) if len(cols) > 8 else "0"
-                    red = clean_val(cols[9].get_text(strip=True)) if len(cols) > 9 else "0"
-                    goals_conceded = clean_val(cols[10].get_text(strip=True)) if len(cols) > 10 else "0"
-                    clean_sheets = clean_val(cols[11].get_text(strip=True)) if len(cols) > 11 else "0"
-
-                    print(f"      [GK STATS SAVED] Matches: {matches}, Yellow: {yellow}, 2ndYellow: {second_yellow}, Red: {red}, GoalsConceded: {goals_conceded}, CleanSheets: {clean_sheets}")
-                else:
-                    # Outfield player table: Matches | Goals | Assists | ... | Yellow | 2ndYellow | Red
-                    goals = clean_val(cols[3].get_text(strip=True)) if len(cols) > 3 else "0"
-                    assists = clean_val(cols[4].get_text(strip=True)) if len(cols) > 4 else "0"
-                    yellow = clean_val(cols[8].get_text(strip=True)) if len(cols) > 8 else "0"
-                    second_yellow = clean_val(cols[9].get_text(strip=True)) if len(cols) > 9 else "0"
-                    red = clean_val(cols[10].get_text(strip=True)) if len(cols) > 10 else "0"
-                    goals_conceded = "0"
-                    clean_sheets = "0"
-
-                    print(f"      [TOTAL STATS SAVED] Matches: {matches}, Goals: {goals}, Assists: {assists}, Yellow: {yellow}, 2ndYellow: {second_yellow}, Red: {red}")
-
-                stat_id = f"{p_id}_Total"
-                save_csv(NODE_DIR, "stats.csv", f'{clean_str(stat_id)},{matches},{goals},{assists},{yellow},{second_yellow},{red},{goals_conceded},{clean_sheets},None,None,None,None,None')
-                save_csv(REL_DIR, "player_has_stats.csv", f"{p_id},{clean_str(stat_id)}")
-                save_csv(REL_DIR, "stats_for_player.csv", f"{clean_str(stat_id)},{p_id}")
+    if s_tree:
+        row = s_tree.css_first('tfoot tr')
+        if row:
+            # Extract every cell once and pad, instead of guarding each index
+            tds = [td.text(strip=True) for td in row.css('td')]
+            tds += ['0'] * (12 - len(tds))
+
+            # Check if player is a Goalkeeper by looking at position
+            is_goalkeeper = pos and ("Goalkeeper" in pos or "keeper" in pos.lower())
+
+            matches = clean_val(tds[2])
+
+            if is_goalkeeper:
+                # GK table: Col2=Matches, Col7=Yellow, Col8=2ndYellow, Col9=Red, Col10=GoalsConceded, Col11=CleanSheets
+                goals = "0"
+                assists = "0"
+                yellow = clean_val(tds[7])
+                second_yellow = clean_val(tds[8])
+                red = clean_val(tds[9])
+                goals_conceded = clean_val(tds[10])
+                clean_sheets = clean_val(tds[11])
+
+                print(f"      [GK STATS SAVED] Matches: {matches}, Yellow: {yellow}, 2ndYellow: {second_yellow}, Red: {red}, GoalsConceded: {goals_conceded}, CleanSheets: {clean_sheets}")
+            else:
+                # Outfield player table: Matches | Goals | Assists | ... | Yellow | 2ndYellow | Red
+                goals = clean_val(tds[3])
+                assists = clean_val(tds[4])
+                yellow = clean_val(tds[8])
+                second_yellow = clean_val(tds[9])
+                red = clean_val(tds[10])
+                goals_conceded = "0"
+                clean_sheets = "0"
+
+                print(f"      [TOTAL STATS SAVED] Matches: {matches}, Goals: {goals}, Assists: {assists}, Yellow: {yellow}, 2ndYellow: {second_yellow}, Red: {red}")
+
+            stat_id = f"{p_id}_Total"
+            save_csv(NODE_DIR, "stats.csv", f'{clean_str(stat_id)},{matches},{goals},{assists},{yellow},{second_yellow},{red},{goals_conceded},{clean_sheets},None,None,None,None,None')
+            save_csv(REL_DIR, "player_has_stats.csv", f"{p_id},{clean_str(stat_id)}")
+            save_csv(REL_DIR, "stats_for_player.csv", f"{clean_str(stat_id)},{p_id}")
 
     # 3. CURRENT CONTRACT
     try:
-        joined = get_profile_value(soup, ["Joined", "In squad since"])
-        expires = get_profile_value(soup, ["Contract expires", "Contract until"])
-        date_pattern = r'(\d{2}[/.]\d{2}[/.]\d{4})|(\w{3} \d{1,2}, \d{4})'
-        
-        sidebar = soup.find('div', class_='info-table')
+        joined = sidebar_value(attrs, ["Joined", "In squad since"])
+        expires = sidebar_value(attrs, ["Contract expires", "Contract until"])
+
+        sidebar = tree.css_first('div.info-table')
         if sidebar:
-            full_text = sidebar.get_text(" ", strip=True)
+            full_text = sidebar.text(separator=" ", strip=True)
             if not expires:
-                match = re.search(r'Contract expires[:\s]+.*?(' + date_pattern + r')', full_text)
-                if match: expires = match.group(1) or match.group(2)
+                match = _RE_EXPIRES.search(full_text)
+                if match: expires = match.group(1)
             if not joined:
-                match = re.search(r'Joined[:\s]+.*?(' + date_pattern + r')', full_text)
-                if match: joined = match.group(1) or match.group(2)
+                match = _RE_JOINED.search(full_text)
+                if match: joined = match.group(1)
 
         if joined or expires:
             c_id = f"{p_id}_Current"
@@ -277,73 +440,70 @@ def scrape_player(player_url, team_id, processed_players):
         print(f"      [DEBUG] Contract error: {e}")
 
     # 4. ACHIEVEMENTS
-    ach_url = player_url.replace("/profil/", "/erfolge/")
-    a_soup = get_soup(ach_url)
-    if a_soup:
-        boxes = a_soup.find_all('div', class_='box')
+    if a_tree:
+        boxes = a_tree.css('div.box')
         for box in boxes:
-            header = box.find('h2')
+            header = box.css_first('h2')
             if header:
-                title_name = header.get_text(strip=True).replace("Titles", "").strip()
+                title_name = header.text(strip=True).replace("Titles", "").strip()
                 if "Relegat" in title_name or "relegat" in title_name or "All titles" in title_name: continue
-                for row in box.find_all('tr'):
-                    cols = row.find_all('td')
+                for row in box.css('tr'):
+                    cols = row.css('td')
                     if len(cols) >= 1:
-                        raw_text = row.get_text(" ", strip=True)
-                        year_match = re.search(r'\d{2}/\d{2}|\d{4}', raw_text)
-                        year = year_match.group(0) if year_match else ""
+                        raw_text = row.text(separator=" ", strip=True)
+                        year = _extract_year(raw_text)
                         if not year and len(cols) > 2:
-                            if re.match(r'\d{2}/\d{2}|\d{4}', cols[2].get_text(strip=True)): 
-                                year = cols[2].get_text(strip=True)
+                            year = _extract_year(cols[2].text(strip=True))
                         if year:
                             a_id = f"{p_id}_{title_name}_{year}".replace(" ", "")
                             print(f"      [ACHIEVEMENT FOUND] {title_name} ({year})")
-                            save_csv(NODE_DIR, "achievements.csv", f'{clean_str(a_id)},{clean_str(title_name)},{clean_str(year)},{clean_str(title_name)},None')
+                            save_csv_unique(NODE_DIR, "achievements.csv", a_id, f'{clean_str(a_id)},{clean_str(title_name)},{clean_str(year)},{clean_str(title_name)},None')
                             save_csv(REL_DIR, "player_has_achievement.csv", f"{p_id},{clean_str(a_id)}")
                             save_csv(REL_DIR, "achievement_won_by.csv", f"{clean_str(a_id)},{p_id},Player")
 
     # 5. INJURIES
-    inj_url = player_url.replace("/profil/", "/verletzungen/")
-    i_soup = get_soup(inj_url)
-    if i_soup:
-        table = i_soup.find('table', class_='items')
+    if i_tree:
+        table = i_tree.css_first('table.items')
         if table:
-            for row in table.select("tbody tr"):
-                cols = row.find_all('td')
-                if len(cols) >= 6:
-                    inj_type = cols[1].get_text(strip=True)
-                    start = cols[2].get_text(strip=True)
-                    end = cols[3].get_text(strip=True)
+            for row in table.css("tbody tr"):
+                cells = [td.text(strip=True) for td in row.css('td')]
+                if len(cells) >= 6:
+                    inj_type = cells[1]
+                    start = cells[2]
+                    end = cells[3]
                     i_id = f"{p_id}_{start}"
                     save_csv(NODE_DIR, "injuries.csv", f'{clean_str(i_id)},{clean_str(inj_type)},{clean_str(start)},{clean_str(end)},None,None')
                     save_csv(REL_DIR, "player_has_injury.csv", f"{p_id},{clean_str(i_id)}")
                     save_csv(REL_DIR, "injury_affected.csv", f"{clean_str(i_id)},{p_id}")
 
-    save_id(PROCESSED_PLAYERS_FILE, p_id)
+    save_id("player", p_id)
 
-def process_league(name, data, processed_teams, processed_players):
+async def process_league(session, name, data, processed_teams, processed_players):
     url = data['url']
     country = data['country']
     l_id = url.split('/')[-1]
     
     print(f"\nProcessing League: {name} (Country: {country})")
-    save_csv(NODE_DIR, "leagues.csv", f'{clean_str(l_id)},{clean_str(name)},None,None')
+    save_csv_unique(NODE_DIR, "leagues.csv", l_id, f'{clean_str(l_id)},{clean_str(name)},None,None')
     save_csv(REL_DIR, "league_located_in.csv", f"{clean_str(l_id)},{clean_str(country)}")
-    save_csv(NODE_DIR, "countries.csv", clean_str(country))
+    save_csv_unique(NODE_DIR, "countries.csv", country, clean_str(country))
 
-    soup = get_soup(url)
+    soup = await get_soup(session, url)
     if not soup: return
 
-    table = soup.find('table', class_='items')
+    table = soup.css_first('table.items')
     if not table: return
 
     teams = []
-    for link in table.find_all('a', href=True):
-        if "/startseite/verein/" in link['href']:
-            t_name = link.get('title')
-            t_id = link['href'].split('/')[-3]
-            if t_id.isdigit() and t_name and not any(t[0] == t_id for t in teams):
-                teams.append((t_id, t_name, link['href']))
+    seen_teams = set()
+    for link in table.css('a[href]'):
+        href = link.attributes.get('href') or ""
+        if "/startseite/verein/" in href:
+            t_name = link.attributes.get('title')
+            t_id = href.split('/')[-3]
+            if t_id.isdigit() and t_name and t_id not in seen_teams:
+                seen_teams.add(t_id)
+                teams.append((t_id, t_name, href))
 
     if TEST_ONE_TEAM_ONLY: teams = teams[:1]
 
@@ -353,68 +513,104 @@ def process_league(name, data, processed_teams, processed_players):
             continue
 
         print(f"  Processing Team: {t_name}")
-        save_csv(NODE_DIR, "teams.csv", f'{t_id},{clean_str(t_name)},{clean_str(name)}')
+        save_csv_unique(NODE_DIR, "teams.csv", t_id, f'{t_id},{clean_str(t_name)},{clean_str(name)}')
         save_csv(REL_DIR, "team_participates_in.csv", f"{t_id},{l_id}")
         save_csv(REL_DIR, "team_based_in.csv", f"{t_id},{clean_str(country)}")
 
-        t_soup = get_soup(t_url)
+        t_soup = await get_soup(session, t_url)
         if t_soup:
             m_name, m_id, m_url = None, None, None
-            for label in ["Manager:", "Trainer:", "Head Coach:", "Coach:"]:
-                label_tag = t_soup.find(string=re.compile(label))
-                if label_tag:
-                    container = label_tag.find_parent('li') or label_tag.find_parent('tr')
-                    if container:
-                        m_link = container.find('a', href=re.compile(r"/profil/trainer/"))
-                        if m_link:
-                            m_name = m_link.get_text(strip=True)
-                            m_id = m_link['href'].split('/')[-1]
-                            m_url = m_link['href']
-                            break
+            # Walk trainer links once and keep the one whose row is labelled
+            # as the manager, instead of a text-regex search per label
+            for m_link in t_soup.css('a[href*="/profil/trainer/"]'):
+                container = m_link.parent
+                while container is not None and container.tag not in ('li', 'tr'):
+                    container = container.parent
+                row_text = container.text(separator=" ", strip=True) if container is not None else ""
+                if any(label in row_text for label in MANAGER_LABELS):
+                    href = m_link.attributes.get('href') or ""
+                    m_name = m_link.text(strip=True)
+                    m_id = href.split('/')[-1]
+                    m_url = href
+                    break
             
             if not m_name:
                 print("    ...Manager not on main page, checking Staff page...")
                 staff_url = t_url.replace("/startseite/", "/mitarbeiter/")
-                staff_soup = get_soup(staff_url)
+                staff_soup = await get_soup(session, staff_url)
                 if staff_soup:
-                    for row in staff_soup.find_all('tr'):
-                        role_text = row.get_text(strip=True)
+                    for row in staff_soup.css('tr'):
+                        role_text = row.text(strip=True)
                         if "Manager" in role_text or "Head Coach" in role_text or "Trainer" in role_text:
                             if "Assistant" in role_text or "Goalkeeper" in role_text or "Athletic" in role_text: continue
-                            m_link = row.find('a', href=re.compile(r"/profil/trainer/"))
+                            m_link = row.css_first('a[href*="/profil/trainer/"]')
                             if m_link:
-                                m_name = m_link.get_text(strip=True)
-                                m_id = m_link['href'].split('/')[-1]
-                                m_url = m_link['href']
+                                href = m_link.attributes.get('href') or ""
+                                m_name = m_link.text(strip=True)
+                                m_id = href.split('/')[-1]
+                                m_url = href
                                 break
 
             if m_name and m_id:
                 if not m_name: m_name = "Unknown Manager"
                 print(f"    [MANAGER FOUND] {m_name}. Fetching details...")
-                m_age, m_nat = scrape_manager_details(m_url)
-                save_csv(NODE_DIR, "managers.csv", f'{m_id},{clean_str(m_name)},{clean_val(m_age)},{clean_str(m_nat)}')
+                m_age, m_nat = await scrape_manager_details(session, m_url)
+                save_csv_unique(NODE_DIR, "managers.csv", m_id, f'{m_id},{clean_str(m_name)},{clean_val(m_age)},{clean_str(m_nat)}')
                 save_csv(REL_DIR, "team_managed_by.csv", f"{t_id},{m_id}")
                 save_csv(REL_DIR, "manager_manages.csv", f"{m_id},{t_id}")
                 if m_nat:
-                    save_csv(NODE_DIR, "countries.csv", clean_str(m_nat))
+                    save_csv_unique(NODE_DIR, "countries.csv", m_nat, clean_str(m_nat))
                     save_csv(REL_DIR, "manager_belongs_to.csv", f"{m_id},{clean_str(m_nat)}")
             else:
                 print("    [MANAGER NOT FOUND] - Check manually.")
 
-            if squad_table := t_soup.find('table', class_='items'):
+            if squad_table := t_soup.css_first('table.items'):
                 p_links = []
-                for a in squad_table.find_all('a', href=True):
-                    if "/profil/spieler/" in a['href']:
-                        if a['href'] not in p_links: p_links.append(a['href'])
-                p_links = list(set(p_links))
-                for p_url in p_links:
-                    scrape_player(p_url, t_id, processed_players)
-
-        save_id(PROCESSED_TEAMS_FILE, t_id)
+                seen_links = set()
+                for a in squad_table.css('a[href]'):
+                    href = a.attributes.get('href') or ""
+                    if "/profil/spieler/" in href and href not in seen_links:
+                        seen_links.add(href)
+                        p_links.append(href)
+
+                # Filter already-processed players here rather than inside
+                # scrape_player, so skipped players never occupy a semaphore slot
+                total = len(p_links)
+                p_links = [u for u in p_links if u.rstrip('/').split('/')[-1] not in processed_players]
+                if total - len(p_links):
+                    print(f"    Skipping {total - len(p_links)} already-processed players")
+
+                sem = asyncio.Semaphore(MAX_CONCURRENCY)
+                async def bounded(p_url):
+                    async with sem:
+                        await scrape_player(session, p_url, t_id, processed_players)
+                await asyncio.gather(*(bounded(p) for p in p_links))
+
+        save_id("team", t_id)
+
+    flush_all()  # rows reach disk at least once per league
+
+async def main():
+    setup_csv_files()
+    pt = load_ids("team", PROCESSED_TEAMS_FILE)
+    pp = load_ids("player", PROCESSED_PLAYERS_FILE)
+    connector = aiohttp.TCPConnector(limit=20, limit_per_host=4, keepalive_timeout=30)
+    if CachedSession is not None:
+        cache = SQLiteBackend(
+            "tm_http_cache.sqlite",
+            expire_after=43200,  # 12h default for profile pages
+            urls_expire_after={
+                "*.transfermarkt.com/*/leistungsdaten/*": 86400,
+                "*.transfermarkt.com/*/verletzungen/*": 3600,
+            }
+        )
+        session_ctx = CachedSession(cache=cache, connector=connector)
+    else:
+        session_ctx = aiohttp.ClientSession(connector=connector)
+    async with session_ctx as session:
+        for k, v in LEAGUES.items():
+            await process_league(session, k, v, pt, pp)
+    print("\nDONE.")
 
 if __name__ == "__main__":
-    setup_csv_files()
-    pt = load_ids(PROCESSED_TEAMS_FILE)
-    pp = load_ids(PROCESSED_PLAYERS_FILE)
-    for k, v in LEAGUES.items(): process_league(k, v, pt, pp)
-    print("\nDONE.")
\ No newline at end of file
+    asyncio.run(main())
\ No newline at end of file
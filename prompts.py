@@ -0,0 +1,121 @@
+"""
+Prompt templates shared by the API (app.py) and the GraphRAG agent (Agent.py).
+
+Templates are built once at import time; call sites substitute only the
+per-request values instead of rebuilding the full prompt text on every call.
+Uses stdlib string.Template so there is no extra dependency.
+"""
+
+from string import Template
+
+# One player's stat block, reused for both sides of a comparison
+PLAYER_BLOCK_TMPL = Template("""    Player $label: $name
+    - Position: $position
+    - Age: $age
+    - Nationality: $nationality
+    - Market Value: $market_value
+    - Goals: $goals
+    - Assists: $assists
+    - Matches: $matches""")
+
+COMPARE_TMPL = Template("""You are a football analyst helping a team manager decide on a transfer.
+
+$context
+
+Compare these players and provide:
+1. <strong>Statistical Comparison</strong>: Goals, assists, goal contributions per match
+2. <strong>Value Analysis</strong>: Is the price fair for what you get?
+3. <strong>Age & Potential</strong>: Who has more years ahead? Room to grow?
+4. <strong>Recommendation</strong>: Which player would you sign and why?
+
+Keep it concise (4-5 paragraphs). Use <strong> tags for headers.""")
+
+SCOUT_TMPL = Template("""You are a football transfer scout advising a team manager.
+
+$team_context
+
+$candidates_text
+
+Budget: Up to €$budget
+Priority: $priority
+
+Recommend the TOP 3 players to sign. For each:
+1. <strong>Why they fit</strong>: How they improve the squad
+2. <strong>Value assessment</strong>: Is the price fair?
+3. <strong>Concerns</strong>: Any risks (age, form, etc.)
+
+Use <strong> tags for player names. Be specific and concise.""")
+
+TEAM_TMPL = Template("""Analyze this football squad:
+
+Team: $team_name
+Players: $player_count
+Average Age: $avg_age
+Total Goals: $total_goals
+
+Squad:
+$players_text
+
+Provide:
+1. <strong>Squad Strengths</strong>: What positions are well-covered
+2. <strong>Areas to Improve</strong>: Where reinforcements are needed
+3. <strong>Transfer Priorities</strong>: Top 2-3 signing recommendations
+
+Use <strong> for emphasis. Be concise (3 paragraphs).""")
+
+CHAT_STREAM_TMPL = Template("""You are a football analytics AI assistant.
+
+$question
+
+Provide a helpful, specific answer.""")
+
+CHAT_FALLBACK_TMPL = Template("""You are a football analytics AI assistant.
+
+$context
+
+User question: $message
+
+Provide a helpful response. If you need specific data, suggest what the user should ask for.""")
+
+# Raw template strings for the GraphRAG chain; Agent.py wraps them in
+# LangChain PromptTemplates (which use {curly} placeholders, not Template's $)
+CYPHER_TEMPLATE = """You are a football transfer analyst expert. Generate a Cypher query to answer the question.
+
+Schema:
+{schema}
+
+Key relationships:
+- (Player)-[:PLAYS_FOR]->(Team)
+- (Player)-[:HAS_STATS]->(Stats)
+- (Player)-[:HAS_CONTRACT]->(Contract)
+- (Team)-[:PARTICIPATES_IN]->(League)
+
+Player properties: name, age, nationality, height, preferred_foot, preferred_positions, market_value
+Stats properties: total_matches, total_goals, total_assists, total_yellow, goals_conceded, clean_sheets
+
+For position searches, use CONTAINS on preferred_positions (e.g., "Centre-Forward", "Central Midfield", "Goalkeeper", "Defensive Midfield", "Left Winger", "Right-Back")
+
+Market values are stored as strings like "€1.20m" or "€500k".
+
+Question: {question}
+
+Return relevant player data including stats for comparison. Always include name, age, market_value, and stats when comparing players.
+
+Cypher Query:"""
+
+QA_TEMPLATE = """You are a football transfer analyst. Based on the data, provide transfer recommendations and player analysis.
+
+Data from database:
+{context}
+
+Question: {question}
+
+Provide a clear analysis with:
+1. Player recommendations ranked by fit
+2. Key stats comparison (goals, assists, matches)
+3. Value for money assessment (age vs market value)
+4. Transfer recommendation with reasoning
+
+Be specific and use the actual data provided. Format the response clearly.
+
+Answer:"""
@@ -0,0 +1,83 @@
+"""
+Quick connectivity check for the OpenRouter LLM used by app.py and Agent.py.
+
+Usage:
+    python test_llm.py
+
+Both checks run concurrently over one client connection, and responses are
+cached on disk by request hash, so re-runs with unchanged prompts cost no
+network calls at all (delete .cache/llm_test to force fresh ones).
+"""
+
+import asyncio
+import hashlib
+import json
+import os
+
+from dotenv import load_dotenv
+from openai import AsyncOpenAI
+
+load_dotenv()
+
+MODEL = "anthropic/claude-sonnet-4"
+CACHE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), ".cache", "llm_test")
+
+client = AsyncOpenAI(
+    api_key=os.getenv("OPENROUTER_API_KEY"),
+    base_url="https://openrouter.ai/api/v1",
+)
+
+
+async def cached_completion(prompt, max_tokens=150):
+    """Chat completion with a small disk cache keyed on the request JSON."""
+    request = {
+        "model": MODEL,
+        "messages": [{"role": "user", "content": prompt}],
+        "max_tokens": max_tokens,
+    }
+    key = hashlib.sha256(json.dumps(request, sort_keys=True).encode()).hexdigest()
+    cache_path = os.path.join(CACHE_DIR, f"{key}.json")
+    if os.path.exists(cache_path):
+        with open(cache_path) as f:
+            return json.load(f)["content"], True
+
+    response = await client.chat.completions.create(**request)
+    content = response.choices[0].message.content
+    os.makedirs(CACHE_DIR, exist_ok=True)
+    with open(cache_path, "w") as f:
+        json.dump({"content": content}, f)
+    return content, False
+
+
+async def test_connection():
+    """Minimal round trip: proves the key, base URL, and model are valid."""
+    content, cached = await cached_completion("Reply with the single word: ok", max_tokens=10)
+    print(f"Connection check{' (cached)' if cached else ''}: {content.strip()}")
+
+
+async def test_football_query():
+    """A domain-shaped prompt, closer to what the API actually sends."""
+    content, cached = await cached_completion(
+        "In one sentence, what makes a good defensive midfielder?"
+    )
+    print(f"Football query{' (cached)' if cached else ''}: {content.strip()}")
+
+
+async def main():
+    if not os.getenv("OPENROUTER_API_KEY"):
+        print("Error: OPENROUTER_API_KEY not set (see .env.example)")
+        return
+
+    # Both checks share the client's connection, so the second skips the
+    # TLS handshake; running them concurrently makes the total ~1 RTT
+    results = await asyncio.gather(
+        test_connection(), test_football_query(), return_exceptions=True
+    )
+    failures = [r for r in results if isinstance(r, Exception)]
+    for exc in failures:
+        print(f"  ⚠️ {type(exc).__name__}: {exc}")
+    print("LLM check failed." if failures else "LLM is reachable.")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())